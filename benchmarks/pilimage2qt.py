@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: benchmark of PIL -> QImage conversion
+
+    Compares the former JPEG round trip with utils.pilImage2Qt, which wraps
+    the raw pixel buffer. Default size is an A3 page scanned at 600 dpi.
+    Every conversion and mode runs in a fresh process, so that its peak
+    resident memory is its own.
+
+    usage: python benchmarks/pilimage2qt.py [width height [repeat]]
+
+    This program is released under the GNU GPLv2
+"""
+
+import os
+import sys
+import time
+import resource
+import subprocess
+
+from PIL import Image
+from PyQt6.QtGui import QImage, QImageReader
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'lector'))
+from utils import pilImage2Qt
+
+
+def pilImage2QtJpeg(im):
+    """ Conversion used up to Lector 1.0.0dev
+    """
+    if im.mode != 'RGB':
+        im = im.convert('RGB')
+    s = im.tobytes("jpeg", "RGB")
+
+    qtimage = QImage()
+    qtimage.loadFromData(s)
+    return qtimage
+
+
+def maxrss():
+    """ Peak resident set size in MB
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss /= 1024
+    return rss / 1024.
+
+
+def bench(function, im, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        qtimage = function(im)
+        elapsed = time.perf_counter() - start
+        assert qtimage.width() == im.size[0]
+        del qtimage
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def child(name, mode, width, height, repeat):
+    """ Print best seconds and peak RSS growth (MB) of one conversion
+    """
+    # the JPEG of a large page exceeds Qt's default limit of 256 MB
+    QImageReader.setAllocationLimit(0)
+    function = {'raw': pilImage2Qt, 'jpeg': pilImage2QtJpeg}[name]
+    # some structure, so JPEG does not compress a flat colour
+    im = Image.effect_noise((width, height), 64).convert(mode)
+    before = maxrss()
+    best = bench(function, im, repeat)
+    print(best, maxrss() - before)
+
+
+def run(name, mode, width, height, repeat):
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--child', name, mode,
+         str(width), str(height), str(repeat)])
+    elapsed, mb = output.split()
+    return float(elapsed), float(mb)
+
+
+def main():
+    if sys.argv[1:2] == ['--child']:
+        name, mode, width, height, repeat = sys.argv[2:7]
+        child(name, mode, int(width), int(height), int(repeat))
+        return
+    width, height = 7016, 9921
+    repeat = 3
+    if len(sys.argv) > 2:
+        width, height = int(sys.argv[1]), int(sys.argv[2])
+    if len(sys.argv) > 3:
+        repeat = int(sys.argv[3])
+
+    print("%dx%d px, best of %d" % (width, height, repeat))
+    for mode in ('L', 'RGB', 'RGBA'):
+        new, newPeak = run('raw', mode, width, height, repeat)
+        old, oldPeak = run('jpeg', mode, width, height, repeat)
+        print("%-4s jpeg %7.3f s (+%4.0f MB peak)   raw %7.3f s "
+              "(+%4.0f MB peak)   %5.1fx" % (mode, old, oldPeak, new, newPeak,
+              old / new))
+
+if __name__ == '__main__':
+    main()
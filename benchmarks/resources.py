@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: benchmark of resource registration
+
+    Compares importing lector/ui/resources_rc.py with registering the
+    compiled bundle lector/ui/resources.rcc (make rcc): time to register
+    and resident memory added. Every run is a fresh process; 'py cold' has
+    no bytecode to start from, like a first launch.
+
+    usage: python benchmarks/resources.py [repeat]
+
+    This program is released under the GNU GPLv2
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+LECTOR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      '..', 'lector')
+BUNDLE = os.path.join(LECTOR, 'ui', 'resources.rcc')
+
+## run in a child process: prints seconds and RSS growth in kB
+CHILD = '''
+import sys, time
+sys.path.insert(0, %r)
+from PyQt6.QtCore import QFile, QResource
+
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4
+
+# Qt's resource system itself is not part of the difference
+QFile.exists(':/none')
+before = rss()
+start = time.perf_counter()
+if sys.argv[1] == 'rcc':
+    assert QResource.registerResource(%r)
+else:
+    from ui import resources_rc
+elapsed = time.perf_counter() - start
+# the icons are really there
+assert QFile.exists(':/icons/icons/configure.png')
+print(elapsed, rss() - before)
+''' % (LECTOR, BUNDLE)
+
+
+def run(source, repeat, cold=False):
+    best = None
+    memory = None
+    for _ in range(repeat):
+        env = dict(os.environ)
+        if cold:
+            # empty bytecode cache, resources_rc.py is compiled again
+            env['PYTHONPYCACHEPREFIX'] = tempfile.mkdtemp()
+        try:
+            output = subprocess.check_output(
+                [sys.executable, '-B', '-c', CHILD, source], env=env)
+        finally:
+            if cold:
+                shutil.rmtree(env['PYTHONPYCACHEPREFIX'])
+        elapsed, kb = output.split()
+        elapsed = float(elapsed)
+        best = elapsed if best is None else min(best, elapsed)
+        memory = int(kb)
+    return best, memory
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    if not os.path.exists(BUNDLE):
+        print("%s not found, run 'make rcc' first" % BUNDLE)
+        return 1
+    print("resources_rc.py %d kB, resources.rcc %d kB, best of %d" % (
+        os.path.getsize(os.path.join(LECTOR, 'ui', 'resources_rc.py')) / 1024,
+        os.path.getsize(BUNDLE) / 1024, repeat))
+    for name, source, cold in (('py cold', 'py', True), ('py', 'py', False),
+                               ('rcc', 'rcc', False)):
+        elapsed, kb = run(source, repeat, cold)
+        print("%-8s %7.2f ms  +%5d kB RSS" % (name, elapsed * 1000, kb))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
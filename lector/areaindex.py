@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: areaindex.py
+
+    Uniform grid of OcrArea rectangles, so that hit testing under the mouse
+    looks only at the areas near the cursor instead of all of them.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import math
+
+## side of a grid cell in scene coordinates (page pixels)
+CELL_SIZE = 256
+
+
+class AreaIndex(object):
+    """ Maps grid cells to the areas overlapping them
+
+    Rectangles are (left, top, right, bottom) in scene coordinates.
+
+    >>> index = AreaIndex(100)
+    >>> index.insert('a', (10, 10, 150, 50))
+    >>> index.insert('b', (120, 300, 180, 350))
+    >>> sorted(index.candidates(140, 40, 5))
+    ['a']
+    >>> index.update('a', (500, 500, 520, 520))
+    >>> sorted(index.candidates(140, 40, 5))
+    []
+    >>> index.remove('b')
+    >>> index.candidates(150, 320, 5)
+    set()
+    """
+    def __init__(self, cellSize=CELL_SIZE):
+        self.cellSize = float(cellSize)
+        self.cells = {}
+        self.ranges = {}
+
+    def _range(self, left, top, right, bottom):
+        """ (first column, first row, last column, last row) of cells
+        """
+        return (int(math.floor(left / self.cellSize)),
+                int(math.floor(top / self.cellSize)),
+                int(math.floor(right / self.cellSize)),
+                int(math.floor(bottom / self.cellSize)))
+
+    def _cells(self, cellRange):
+        x0, y0, x1, y1 = cellRange
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                yield cx, cy
+
+    def insert(self, item, rect):
+        cellRange = self._range(*rect)
+        self.ranges[item] = cellRange
+        for cell in self._cells(cellRange):
+            self.cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item):
+        cellRange = self.ranges.pop(item, None)
+        if cellRange is None:
+            return
+        for cell in self._cells(cellRange):
+            items = self.cells[cell]
+            items.discard(item)
+            if not items:
+                del self.cells[cell]
+
+    def update(self, item, rect):
+        """ Move item already in the index to rect
+        """
+        if item not in self.ranges:
+            return
+        if self._range(*rect) != self.ranges[item]:
+            self.remove(item)
+            self.insert(item, rect)
+
+    def clear(self):
+        self.cells = {}
+        self.ranges = {}
+
+    def candidates(self, x, y, margin=0.):
+        """ Areas that may be within margin of point (x, y)
+        """
+        found = set()
+        for cell in self._cells(self._range(x - margin, y - margin,
+                                            x + margin, y + margin)):
+            found.update(self.cells.get(cell, ()))
+        return found
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: areastore.py
+
+    Geometry and kind of the areas of a page, kept in NumPy arrays. Rows are
+    in reading order; the number of an area is its row + 1, so removing an
+    area renumbers the following ones without touching them. OcrArea items
+    are only views of the rows.
+
+    Every area also has an id that does not change when other areas are
+    removed; OCR results are kept by id as (content key, text), the words
+    of text areas (ocrwords.Words) by id too.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import numpy as np
+
+
+class AreaStore(object):
+    """ Rows of (left, top, right, bottom) boxes and kinds, one per item
+
+    >>> store = AreaStore()
+    >>> for name, left in (('a', 0), ('b', 10), ('c', 20)):
+    ...     _ = store.append(name, (left, 0, left + 5, 5), 1)
+    >>> store.remove('a')
+    >>> store.row('c'), store.pixelBoxes()
+    (1, [(10, 0, 15, 5), (20, 0, 25, 5)])
+    >>> store.setKind('b', 2)
+    >>> store.kinds().tolist()
+    [2, 1]
+    >>> store.ids().tolist()
+    [2, 3]
+    """
+    def __init__(self, capacity=64):
+        self.items = []
+        self.results = {}
+        self.words = {}
+        self._boxes = np.zeros((capacity, 4))
+        self._kinds = np.zeros(capacity, np.int8)
+        self._ids = np.zeros(capacity, np.int64)
+        self._nextId = 1
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def _reserve(self, size):
+        if size > len(self._kinds):
+            capacity = max(size, 2 * len(self._kinds))
+            boxes = np.zeros((capacity, 4))
+            boxes[:len(self)] = self.boxes()
+            kinds = np.zeros(capacity, np.int8)
+            kinds[:len(self)] = self.kinds()
+            ids = np.zeros(capacity, np.int64)
+            ids[:len(self)] = self.ids()
+            self._boxes, self._kinds, self._ids = boxes, kinds, ids
+
+    def append(self, item, box, kind):
+        """ Add item as the last row, returns the row
+        """
+        row = len(self)
+        self._reserve(row + 1)
+        self._boxes[row] = box
+        self._kinds[row] = kind
+        self._ids[row] = self._nextId
+        self._nextId += 1
+        self.items.append(item)
+        self._rows[item] = row
+        return row
+
+    def remove(self, item):
+        row = self.row(item)
+        size = len(self)
+        # shift the following rows up, their numbers follow
+        self._boxes[row:size - 1] = self._boxes[row + 1:size]
+        self._kinds[row:size - 1] = self._kinds[row + 1:size]
+        self._ids[row:size - 1] = self._ids[row + 1:size]
+        del self.items[row]
+        self._rows = None
+
+    def clear(self):
+        self.items = []
+        self.results = {}
+        self.words = {}
+        self._rows = {}
+
+    def row(self, item):
+        """ Row (position in reading order) of item
+        """
+        if self._rows is None:
+            self._rows = dict((item, row) for row, item
+                              in enumerate(self.items))
+        return self._rows[item]
+
+    def setBox(self, item, box):
+        self._boxes[self.row(item)] = box
+
+    def setKind(self, item, kind):
+        self._kinds[self.row(item)] = kind
+
+    def boxes(self):
+        """ (n, 4) array view of the boxes
+        """
+        return self._boxes[:len(self)]
+
+    def kinds(self):
+        return self._kinds[:len(self)]
+
+    def ids(self):
+        return self._ids[:len(self)]
+
+    def pixelBoxes(self):
+        """ Boxes as tuples of ints, for cropping the page
+        """
+        return [tuple(box) for box in self.boxes().astype(int).tolist()]
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: batch.py
+
+    Headless batch OCR: lector --batch [options] FILE|DIR|GLOB ...
+
+    Pages go through the same crop / rescale / grayscale / tesseract path
+    as QOcrWidget.doOcr and are spread over a pool of processes. With
+    fewer files than processes, the areas of each page are spread over the
+    pool instead, the page is shared with the workers through shared
+    memory (sharedpage.py). No QApplication is created, so no display is
+    needed.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+from html import escape
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from ocrengine import get_engine, preprocessing, recognize_area
+from ocrpage import OcrPage
+from sharedpage import SharedPage, attach
+from ocrcache import OcrCache, get_cache
+from layout import analyse_page, clip_box
+import preprocess
+from utils import settings
+
+IMAGE_EXTENSIONS = ('.tif', '.tiff', '.png', '.jpg', '.jpeg', '.xpm', '.bmp',
+                    '.pnm', '.pbm', '.pgm', '.ppm')
+FORMATS = ('txt', 'html', 'hocr')
+STAGES = ('load', 'preprocess', 'ocr', 'write')
+
+HOCR_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"
+    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">
+ <head>
+  <title>%s</title>
+  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>
+  <meta name='ocr-system' content='tesseract'/>
+  <meta name='ocr-capabilities' content='ocr_page ocr_carea ocr_par ocr_line ocrx_word'/>
+ </head>
+ <body>
+'''
+HOCR_FOOTER = ''' </body>
+</html>
+'''
+
+
+def expand_inputs(patterns):
+    """ Files given directly, found in directories or matched by globs
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files += sorted(os.path.join(pattern, fn)
+                            for fn in os.listdir(pattern)
+                            if fn.lower().endswith(IMAGE_EXTENSIONS))
+        elif os.path.exists(pattern):
+            files.append(pattern)
+        else:
+            files += sorted(glob.glob(pattern))
+    return files
+
+
+def read_layout(filename):
+    """ Areas from layout file: {"areas": [{"box": [l, t, r, b], "kind": 1}]}
+    """
+    with open(filename, 'r') as layout_file:
+        layout = json.load(layout_file)
+    return [(tuple(area['box']), area.get('kind', 1))
+            for area in layout['areas']]
+
+
+class HocrText(HTMLParser):
+    """ Plain text of a hOCR document (words, lines and paragraphs)
+    """
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.paragraphs = []
+        self.inWord = False
+
+    def handle_starttag(self, tag, attrs):
+        cls = dict(attrs).get('class', '')
+        if cls == 'ocr_par':
+            self.paragraphs.append([])
+        elif cls == 'ocr_line' or cls.startswith('ocr_textfloat') or \
+                cls in ('ocr_header', 'ocr_caption'):
+            if not self.paragraphs:
+                self.paragraphs.append([])
+            self.paragraphs[-1].append([])
+        elif cls == 'ocrx_word':
+            self.inWord = True
+            if not self.paragraphs:
+                self.paragraphs.append([[]])
+            self.paragraphs[-1][-1].append('')
+
+    def handle_endtag(self, tag):
+        if tag == 'span':
+            self.inWord = False
+
+    def handle_data(self, data):
+        if self.inWord:
+            self.paragraphs[-1][-1][-1] += data
+
+    def text(self):
+        return '\n\n'.join('\n'.join(' '.join(w for w in line if w)
+                                     for line in par)
+                           for par in self.paragraphs if par)
+
+
+def hocr_text(hocr):
+    parser = HocrText()
+    parser.feed(hocr)
+    return parser.text()
+
+
+def hocr_to_page(hocr, index, box, scale):
+    """ Body of area hOCR with bboxes in page coordinates and unique ids
+    """
+    match = re.search(r'<body>(.*)</body>', hocr, re.S)
+    body = match.group(1) if match else hocr
+
+    def bbox(m):
+        coords = [int(int(v) / scale) for v in m.groups()]
+        return 'bbox %d %d %d %d' % (coords[0] + box[0], coords[1] + box[1],
+                                     coords[2] + box[0], coords[3] + box[1])
+
+    body = re.sub(r'bbox (\d+) (\d+) (\d+) (\d+)', bbox, body)
+    return re.sub(r"id='([^']+)'", r"id='area%s_\1'" % index, body)
+
+
+def recognize_shared(descriptor, index, box, lang, output, scale, dpi):
+    """ Recognize area box of a SharedPage (in a worker process)
+    """
+    left, top, right, bottom = box
+    # only the area is copied out of the shared page
+    region = Image.fromarray(attach(descriptor)[top:bottom, left:right])
+    return recognize_area(get_engine(1), index, region, lang, output, scale,
+                          dpi)
+
+
+def ocr_page(filename, areas, lang, formats, outdir, pool=None):
+    """ OCR all frames of one image file and write outputs (in a worker)
+
+    With pool (a process pool), the text areas of every page are
+    recognized side by side by its workers; the page is shared with them
+    through shared memory.
+
+    Returns (number of pages, {stage: seconds}); preprocessing stages are
+    reported under their own names as well.
+    """
+    timing = dict.fromkeys(STAGES, 0.)
+    stages = preprocess.selected_stages()
+    engine = get_engine(1)
+    cache = get_cache()
+    output = 'hocr' if 'hocr' in formats else 'txt'
+    if cache:
+        engineVersion = engine.version()
+    base = os.path.splitext(os.path.basename(filename))[0]
+
+    start = time.time()
+    im = Image.open(filename)
+    frames = [frame.copy() for frame in ImageSequence.Iterator(im)]
+    timing['load'] += time.time() - start
+
+    texts = []
+    hocrs = []
+    html = []
+    for pageno, page in enumerate(frames):
+        start = time.time()
+        pageTiming = {}
+        page = preprocess.straighten_page(page, stages, pageTiming)
+        workPage = OcrPage(page)
+        ocrPage = workPage.ocrImage(stages, pageTiming)
+        for stage, seconds in pageTiming.items():
+            timing[stage] = timing.get(stage, 0.) + seconds
+        scale, dpi = workPage.textScale()
+        timing['preprocess'] += time.time() - start
+
+        start = time.time()
+        if areas == 'auto':
+            pageAreas = analyse_page(page, workPage.gray())
+        else:
+            pageAreas = areas or [((0, 0) + page.size, 1)]
+        # only the part of an area on the page counts (the workers slice
+        # the shared page with these boxes), areas off the page are dropped
+        pageAreas = [(clip_box(box, *page.size), kind)
+                     for box, kind in pageAreas]
+        pageAreas = [(box, kind) for box, kind in pageAreas
+                     if box[0] < box[2] and box[1] < box[3]]
+
+        # cached texts first; with an area pool, the other text areas are
+        # submitted at once and cropped by the workers from shared memory
+        areaTexts = {}
+        keys = {}
+        futures = {}
+        shared = SharedPage(np.asarray(ocrPage)) if pool else None
+        try:
+            for i, (box, kind) in enumerate(pageAreas):
+                if kind != 1:
+                    continue
+                if cache:
+                    keys[i] = OcrCache.key(ocrPage.crop(box), lang,
+                                           engineVersion,
+                                           preprocessing(scale) + ';' + output)
+                    text = cache.get(keys[i])
+                    if text is not None:
+                        areaTexts[i] = text
+                        continue
+                print("%s: area %d: scale %.2f, %d dpi" % (filename, i + 1,
+                      scale, dpi))
+                if pool:
+                    futures[i] = pool.submit(recognize_shared,
+                                             shared.descriptor, i, box, lang,
+                                             output, scale, dpi)
+
+            for i, (box, kind) in enumerate(pageAreas):
+                if kind != 1:
+                    imgname = '%s.%d.%d.png' % (base, pageno, i)
+                    page.crop(box).save(os.path.join(outdir, imgname))
+                    html.append("<img src='%s'>" % escape(imgname))
+                    continue
+
+                text = areaTexts.get(i)
+                if text is None:
+                    if i in futures:
+                        result = futures[i].result()
+                    else:
+                        result = recognize_area(engine, i, ocrPage.crop(box),
+                                                lang, output, scale, dpi)
+                    if result.returncode:
+                        print("%s: tesseract was unabled to process area %d! "
+                              "(exit code %d)\n%s" % (filename, i + 1,
+                              result.returncode, result.error),
+                              file=sys.stderr)
+                        continue
+                    text = result.text
+                    if cache:
+                        cache.put(keys[i], text)
+
+                if output == 'hocr':
+                    hocrs.append(hocr_to_page(text, '%d_%d' % (pageno, i),
+                                              box, scale))
+                    text = hocr_text(text)
+                texts.append(text)
+                html.append('<p>%s</p>' % escape(text).replace('\n',
+                                                                '<br>\n'))
+        finally:
+            if shared:
+                shared.close()
+        timing['ocr'] += time.time() - start
+
+    start = time.time()
+    outbase = os.path.join(outdir, base)
+    if 'txt' in formats:
+        with open(outbase + '.txt', 'w', encoding='utf-8') as out:
+            out.write('\n'.join(texts))
+    if 'html' in formats:
+        with open(outbase + '.html', 'w', encoding='utf-8') as out:
+            out.write('<html><head><meta charset="utf-8"><title>%s</title>'
+                      '</head><body>\n%s\n</body></html>\n'
+                      % (escape(base), '\n'.join(html)))
+    if 'hocr' in formats:
+        with open(outbase + '.hocr', 'w', encoding='utf-8') as out:
+            out.write(HOCR_HEADER % escape(base) + ''.join(hocrs) +
+                      HOCR_FOOTER)
+    if cache:
+        cache.evict()
+    timing['write'] += time.time() - start
+
+    return len(frames), timing
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='lector --batch',
+                                     description='Headless batch OCR')
+    parser.add_argument('inputs', nargs='+', metavar='FILE|DIR|GLOB',
+                        help='images, directories of images or glob patterns')
+    parser.add_argument('-l', '--lang', default='eng',
+                        help='tesseract language(s), e.g. eng+deu')
+    parser.add_argument('-f', '--format', action='append', choices=FORMATS,
+                        help='output format, may be repeated (default txt)')
+    parser.add_argument('-o', '--output-dir',
+                        help='directory for outputs (default: next to input)')
+    parser.add_argument('-a', '--layout',
+                        help='JSON area layout used for every page or '
+                             '"auto" to detect areas of each page '
+                             '(default: whole page as one text area)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='number of worker processes')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    formats = args.format or ['txt']
+    if args.layout == 'auto':
+        areas = 'auto'
+    else:
+        areas = read_layout(args.layout) if args.layout else None
+    jobs = args.jobs or settings.get('tesseract-ocr:workers')
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No input images found.", file=sys.stderr)
+        return 1
+    if args.output_dir and not os.path.exists(args.output_dir):
+        os.makedirs(args.output_dir)
+    if jobs > 1:
+        # one tesseract thread per process, the pool provides parallelism
+        os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+    pages = 0
+    failed = 0
+    timing = {}
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for filename in files:
+            outdir = args.output_dir or os.path.dirname(filename) or '.'
+            if len(files) < jobs:
+                # areas of a page in parallel, files one after another
+                future = Future()
+                try:
+                    future.set_result(ocr_page(filename, areas, args.lang,
+                                               formats, outdir, pool))
+                except Exception as ex:
+                    future.set_exception(ex)
+            else:
+                future = pool.submit(ocr_page, filename, areas, args.lang,
+                                     formats, outdir)
+            futures[future] = filename
+        for future in as_completed(futures):
+            try:
+                count, pageTiming = future.result()
+            except Exception as ex:
+                print("%s: %s" % (futures[future], ex), file=sys.stderr)
+                failed += 1
+                continue
+            pages += count
+            for stage, seconds in pageTiming.items():
+                timing[stage] = timing.get(stage, 0.) + seconds
+            print(futures[future])
+    elapsed = time.time() - start
+
+    print("\n%d page(s) from %d file(s) in %.1f s: %.1f pages/min, "
+          "%d worker(s)" % (pages, len(files) - failed, elapsed,
+          60. * pages / elapsed if elapsed else 0., jobs))
+    for stage in STAGES:
+        print("  %-10s %8.2f s total %8.3f s/page" % (stage,
+              timing.get(stage, 0.), timing.get(stage, 0.) / pages
+              if pages else 0.))
+        if stage == 'preprocess':
+            for name in preprocess.STAGES:
+                if name in timing:
+                    print("    %-8s %8.2f s total %8.3f s/page" % (name,
+                          timing[name], timing[name] / pages))
+    if failed:
+        print("%d file(s) failed." % failed)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
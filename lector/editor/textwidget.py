@@ -17,7 +17,7 @@ import re
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import (QIcon, QFont, QTextCharFormat, QMouseEvent,
                          QTextCursor, QTextOption, QTextDocumentWriter, QAction)
-from PyQt6.QtCore import pyqtSignal, QEvent, QIODevice, QTextStream
+from PyQt6.QtCore import pyqtSignal, QEvent, QIODevice, QTextStream, QFile
 # QAction has moved to PyQt6.QtGui
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QMenu, QMessageBox, QToolBar, QFileDialog, QTextEdit)
 from PyQt6.QtPrintSupport import QPrinter
@@ -29,9 +29,10 @@ CMD_FOLDER += "/../../"
 if CMD_FOLDER not in sys.path:
     sys.path.insert(0, CMD_FOLDER)
 
-from lector.ui import resources_rc
+# Lector has registered the resources already, a standalone editor not
+if not QFile.exists(":/icons/icons/configure.png"):
+    from lector.ui import resources_rc
 from lector.utils import settings
-from lector.settingsdialog import Settings
 from lector.editor.spellchecker import Highlighter, SpellAction
 
 class EditorBar(QToolBar):
@@ -128,6 +129,8 @@ class EditorBar(QToolBar):
         self.addAction(self.SuperscriptAction)
 
     def settings(self):
+        from lector.settingsdialog import Settings
+
         lectorSettings = Settings(self, 1)
 #        QObject.connect(lectorSettings, SIGNAL('accepted()'),
 #                    self.updateTextEditor)
@@ -559,6 +562,98 @@ class TextWidget(QTextEdit):
         self.mergeCurrentCharFormat(charFmt)
 
 
+    def appendArea(self, areaId, text, html=False):
+        """ Append text of area as new block(s) marked with areaId
+        """
+        block = self.document().lastBlock()
+        if self.document().isEmpty():
+            cursor = QTextCursor(block)
+        else:
+            cursor = QTextCursor(self.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertBlock()
+        self._insertArea(cursor, areaId, text, html)
+
+    def _insertArea(self, cursor, areaId, text, html):
+        start = cursor.position()
+        if html:
+            cursor.insertHtml(text)
+        else:
+            cursor.insertText(text)
+        block = self.document().findBlock(start)
+        last = self.document().findBlock(cursor.position())
+        while block.isValid():
+            block.setUserState(areaId)
+            if block == last:
+                break
+            block = block.next()
+
+    def _areaBlocks(self, areaId, previousIds=()):
+        """ Blocks of area and last block of any of previousIds before them
+        """
+        blocks = []
+        anchor = None
+        block = self.document().begin()
+        while block.isValid():
+            state = block.userState()
+            if state == areaId:
+                blocks.append(block)
+            elif not blocks and state in previousIds:
+                anchor = block
+            block = block.next()
+        return blocks, anchor
+
+    def setAreaText(self, areaId, text, previousIds=(), html=False):
+        """ Replace text of area by text
+
+        A new area is placed after the blocks of the last of previousIds
+        (areas before it in reading order) found in the document. Other
+        blocks, including the user's corrections, are not touched.
+        """
+        blocks, anchor = self._areaBlocks(areaId, set(previousIds))
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+        if blocks:
+            cursor.setPosition(blocks[0].position())
+            cursor.setPosition(blocks[-1].position() + blocks[-1].length() - 1,
+                               QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+        elif anchor is not None:
+            cursor.setPosition(anchor.position() + anchor.length() - 1)
+            cursor.insertBlock()
+        elif not self.document().isEmpty():
+            # before everything; the first block keeps its mark when split
+            first = self.document().begin()
+            state = first.userState()
+            cursor.insertBlock()
+            first.next().setUserState(state)
+            cursor.setPosition(0)
+        self._insertArea(cursor, areaId, text, html)
+        cursor.endEditBlock()
+
+    def removeAreaText(self, areaId):
+        blocks, _ = self._areaBlocks(areaId)
+        if not blocks:
+            return
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+        cursor.setPosition(blocks[0].position())
+        cursor.setPosition(blocks[-1].position() + blocks[-1].length() - 1,
+                           QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        # drop the emptied block; the merged block keeps the neighbour's mark
+        block = cursor.block()
+        if block.previous().isValid():
+            state = block.previous().userState()
+            cursor.deletePreviousChar()
+        elif block.next().isValid():
+            state = block.next().userState()
+            cursor.deleteChar()
+        else:
+            state = -1
+        cursor.block().setUserState(state)
+        cursor.endEditBlock()
+
     def saveAs(self):
         if settings.get("file_dialog_dir"):
             self.curDir = '~/'
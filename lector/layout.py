@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: layout.py
+
+    Automatic page segmentation: the page is binarized (Otsu), reduced to
+    a coarse ink map, smeared so that words and lines melt into blocks and
+    recursively cut along white rows/columns of its projection profiles
+    (XY-cut). Leaves of the cut are the proposed areas, already in reading
+    order (top to bottom, columns left to right).
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import numpy as np
+
+## resolution of the ink map used for cutting
+WORK_DPI = 75
+## smallest white gap (inches) separating blocks vertically / horizontally
+MIN_GAP_Y = .12
+MIN_GAP_X = .2
+## blocks smaller than this (inches, both sides) are noise
+MIN_BLOCK = .08
+
+## classify_region: kind of regions without anything to read
+BLANK = 0
+## regions flatter than this (gray level deviation) are blank
+BLANK_STD = 6.
+## fewer ink pixels or vertical strokes (left/right letter edges per pixel)
+## than this and the region is blank, a rule or a few specks
+MIN_INK = .003
+MIN_EDGES = .004
+## gray level step counted as an edge
+EDGE_STEP = 48
+## regions are classified on at most this many pixels
+CLASSIFY_PIXELS = 1000000
+
+
+def otsu_threshold(gray):
+    """ Otsu threshold of uint8 array
+
+    >>> otsu_threshold(np.array([10, 10, 12, 200, 202, 204], np.uint8))
+    12
+    """
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight0 = np.cumsum(hist)
+    weight1 = weight0[-1] - weight0
+    sum0 = np.cumsum(hist * levels)
+    mean0 = sum0 / np.maximum(weight0, 1)
+    mean1 = (sum0[-1] - sum0) / np.maximum(weight1, 1)
+    variance = weight0 * weight1 * (mean0 - mean1) ** 2
+    return int(np.argmax(variance))
+
+
+def ink_mask(gray):
+    """ True for dark (ink) pixels of uint8 array
+    """
+    return gray <= otsu_threshold(gray)
+
+
+def page_dpi(im, default=300):
+    dpi = im.info.get('dpi')
+    if dpi and dpi[0] > 1:
+        return int(round(dpi[0]))
+    return default
+
+
+def clip_box(box, width, height):
+    """ Box (left, top, right, bottom) clipped to a page of width x height;
+    areas may reach out of the page, negative indexes would wrap around
+
+    >>> clip_box((-20, 50, 500, 600), 400, 300)
+    (0, 50, 400, 300)
+    """
+    left, right = [min(max(x, 0), width) for x in box[::2]]
+    top, bottom = [min(max(y, 0), height) for y in box[1::2]]
+    return (left, top, right, bottom)
+
+
+def x_height(gray, stripes=4):
+    """ Median x-height (pixels) of text lines of uint8 page, 0 if unknown
+
+    The page is split into vertical stripes, so lines of neighbouring
+    columns do not merge. The x-height of a line is the number of its rows
+    with at least half of the ink of its densest row.
+    """
+    ink = ink_mask(gray)
+    height, width = ink.shape
+    heights = []
+    for stripe in range(stripes):
+        profile = np.count_nonzero(ink[:, stripe * width // stripes:
+                                      (stripe + 1) * width // stripes], axis=1)
+        for top, bottom in _segments(profile, 1):
+            if bottom - top < 4 or bottom - top > height / 10.:
+                continue
+            line = profile[top:bottom]
+            heights.append(np.count_nonzero(line * 2 >= line.max()))
+    return float(np.median(heights)) if heights else 0.
+
+
+def _reduce(mask, factor):
+    """ Block-wise 'any' of boolean array (max pooling)
+    """
+    height = mask.shape[0] // factor * factor
+    width = mask.shape[1] // factor * factor
+    return mask[:height, :width].reshape(height // factor, factor,
+                                         width // factor, factor) \
+        .any(axis=3).any(axis=1)
+
+
+def _smear(mask, dx, dy):
+    """ Dilate mask by dx columns and dy rows (run length smoothing)
+    """
+    out = mask.copy()
+    for shift in range(1, dx + 1):
+        out[:, shift:] |= mask[:, :-shift]
+        out[:, :-shift] |= mask[:, shift:]
+    result = out.copy()
+    for shift in range(1, dy + 1):
+        result[shift:, :] |= out[:-shift, :]
+        result[:-shift, :] |= out[shift:, :]
+    return result
+
+
+def _segments(profile, minGap):
+    """ (start, end) of non-empty runs separated by at least minGap zeros
+
+    >>> _segments(np.array([0, 1, 1, 0, 1, 0, 0, 0, 1]), 2)
+    [(1, 5), (8, 9)]
+    """
+    idx = np.flatnonzero(profile)
+    if not idx.size:
+        return []
+    breaks = np.flatnonzero(np.diff(idx) > minGap)
+    starts = np.r_[idx[0], idx[breaks + 1]]
+    ends = np.r_[idx[breaks], idx[-1]] + 1
+    return [(int(s), int(e)) for s, e in zip(starts, ends)]
+
+
+def _bands(mask, rows, minGapX):
+    """ Merge consecutive row bands sharing a column gutter
+
+    Paragraph gaps of two columns often line up; cutting across them would
+    interleave the columns. Bands that still have a white gutter when taken
+    together stay in one group, which is later cut into columns.
+    """
+    groups = [list(rows[0])]
+    for r0, r1 in rows[1:]:
+        union = mask[groups[-1][0]:r1]
+        if len(_segments(union.any(axis=0), minGapX)) > 1:
+            groups[-1][1] = r1
+        else:
+            groups.append([r0, r1])
+    return groups
+
+
+def xy_cut(mask, minGapY, minGapX, top=0, left=0, blocks=None):
+    """ Recursive XY-cut of boolean mask, leaves in reading order
+
+    Columns are cut first, so the text of a column is read before the next
+    one. Returns list of (top, left, bottom, right) in mask coordinates.
+    """
+    if blocks is None:
+        blocks = []
+    rows = _segments(mask.any(axis=1), minGapY)
+    if not rows:
+        return blocks
+    # trim to content, so outer margins do not count as gaps
+    y0, y1 = rows[0][0], rows[-1][1]
+    columns = _segments(mask[y0:y1].any(axis=0), minGapX)
+    x0, x1 = columns[0][0], columns[-1][1]
+
+    if len(columns) > 1:
+        for c0, c1 in columns:
+            xy_cut(mask[y0:y1, c0:c1], minGapY, minGapX, top + y0,
+                   left + c0, blocks)
+    elif len(rows) > 1:
+        for r0, r1 in _bands(mask[:, x0:x1], rows, minGapX):
+            xy_cut(mask[r0:r1, x0:x1], minGapY, minGapX, top + r0,
+                   left + x0, blocks)
+    else:
+        blocks.append((top + y0, left + x0, top + y1, left + x1))
+    return blocks
+
+
+def classify_block(gray, ink):
+    """ 1 for text, 2 for picture (OcrArea kind)
+
+    Text is mostly paper with a little black ink; photographs and drawings
+    have lots of ink or many mid tones.
+    """
+    midtones = np.count_nonzero((gray > 64) & (gray < 192)) / float(gray.size)
+    inkRatio = np.count_nonzero(ink) / float(ink.size)
+    if midtones > .3 or inkRatio > .45:
+        return 2
+    return 1
+
+
+def classify_region(gray):
+    """ BLANK, 1 (text) or 2 (picture) for uint8 array of an area
+
+    Cheap enough to run before every OCR: deviation, ink ratio and the
+    density of vertical edges, which letters have plenty of and rules,
+    margins and scanner noise do not.
+
+    >>> rng = np.random.RandomState(0)
+    >>> paper = np.full((200, 400), 235, np.uint8)
+    >>> classify_region(paper)
+    0
+    >>> ruled = paper.copy(); ruled[100:103] = 20
+    >>> classify_region(ruled)
+    0
+    >>> text = paper.copy()
+    >>> for top in range(20, 180, 30):
+    ...     for left in range(10, 390, 12):
+    ...         text[top:top + 14, left:left + 2] = 20
+    >>> classify_region(text)
+    1
+    >>> classify_region(rng.randint(0, 256, (200, 400)).astype(np.uint8))
+    2
+    """
+    if not gray.size:
+        return BLANK
+    step = int(np.ceil(np.sqrt(gray.size / float(CLASSIFY_PIXELS))))
+    if step > 1:
+        gray = gray[::step, ::step]
+    if gray.std() < BLANK_STD:
+        return BLANK
+    ink = ink_mask(gray)
+    edges = np.abs(np.diff(gray.astype(np.int16), axis=1)) > EDGE_STEP
+    if (np.count_nonzero(ink) < MIN_INK * ink.size or
+            np.count_nonzero(edges) < MIN_EDGES * edges.size):
+        return BLANK
+    return classify_block(gray, ink)
+
+
+def text_strips(gray, count):
+    """ Split uint8 text area into about count horizontal strips
+
+    Returns [(top, bottom, ownTop, ownBottom)]: rows to recognize and the
+    rows the strip is responsible for. Cuts go through the white gap
+    between lines nearest to the even cut; when there is none, strips
+    overlap by two lines and a word belongs to the strip owning its
+    center.
+
+    >>> area = np.full((100, 50), 255, np.uint8)
+    >>> for top in range(5, 95, 10):
+    ...     area[top:top + 5, 5:45] = 0
+    >>> text_strips(area, 2)
+    [(0, 52, 0, 52), (52, 100, 52, 100)]
+    >>> area[:] = 0
+    >>> text_strips(area, 2)
+    [(0, 75, 0, 50), (25, 100, 50, 100)]
+    """
+    height = gray.shape[0]
+    if count < 2 or not gray.size:
+        return [(0, height, 0, height)]
+    # rows with a few specks are still white
+    profile = np.count_nonzero(ink_mask(gray), axis=1) > \
+        max(1, gray.shape[1] // 500)
+    lines = _segments(profile, 1)
+    overlap = height // count // 2
+    if lines:
+        overlap = min(overlap, 2 * int(np.median([end - start
+                                                  for start, end in lines])))
+    # white gaps between lines, cut in their middle
+    gaps = [(end + start) // 2 for (_, end), (start, _)
+            in zip(lines[:-1], lines[1:])]
+
+    strips = []
+    top = 0
+    window = height / (2. * count)
+    for k in range(1, count):
+        ideal = height * k / float(count)
+        near = [gap for gap in gaps if abs(gap - ideal) < window and gap > top]
+        if near:
+            cut = min(near, key=lambda gap: abs(gap - ideal))
+            pad = 0
+        else:
+            cut = int(ideal)
+            pad = overlap
+        strips.append([top, cut, pad])
+        top = cut
+    strips.append([top, height, 0])
+
+    result = []
+    for k, (ownTop, ownBottom, pad) in enumerate(strips):
+        # a forced cut widens both strips next to it
+        padTop = strips[k - 1][2] if k else 0
+        result.append((max(ownTop - padTop, 0), min(ownBottom + pad, height),
+                       ownTop, ownBottom))
+    return result
+
+
+def analyse_page(im, gray=None):
+    """ Proposed areas of PIL image as [((left, top, right, bottom), kind)]
+
+    gray is the page as uint8 array, if there is one already.
+    """
+    if gray is None:
+        gray = np.asarray(im.convert('L'))
+    ink = ink_mask(gray)
+    dpi = page_dpi(im)
+    factor = max(1, int(round(dpi / float(WORK_DPI))))
+    workDpi = dpi / float(factor)
+
+    small = _reduce(ink, factor)
+    # melt letters into words and words into lines, keep columns apart
+    small = _smear(small, int(workDpi * .04), int(workDpi * .02))
+
+    minBlock = MIN_BLOCK * workDpi
+    areas = []
+    for top, left, bottom, right in xy_cut(small,
+                                           max(1, int(workDpi * MIN_GAP_Y)),
+                                           max(1, int(workDpi * MIN_GAP_X))):
+        if bottom - top < minBlock and right - left < minBlock:
+            continue
+        box = (left * factor, top * factor,
+               min(right * factor, im.size[0]),
+               min(bottom * factor, im.size[1]))
+        kind = classify_block(gray[box[1]:box[3], box[0]:box[2]],
+                              ink[box[1]:box[3], box[0]:box[2]])
+        areas.append((box, kind))
+    return areas
@@ -13,22 +13,31 @@
 # System
 import sys
 import os
+# first, it times everything after it
+import startup
 from PyQt6.QtGui import QIcon
 # qsrand is deprecated/obsolete in modern Qt versions (since Qt 5.10)
 import random
 # added Qt, QByteArray
 from PyQt6.QtCore import (Qt, QSettings, QPoint, QSize, QTime, pyqtSlot,
-						  QLocale, QTranslator, QByteArray)
+						  QLocale, QTranslator, QByteArray, QTimer)
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QDialog, QFileDialog,
 							 QMessageBox)
+startup.mark('Qt imports')
 
 # Lector
+# the settings dialog, OCR, preprocessing and scanning modules are imported
+# when first used, the window does not need them
+from utils import load_resources
+load_resources()
+startup.mark('resources')
 from ui.ui_lector import Ui_Lector
-from settingsdialog import Settings
 from ocrwidget import QOcrWidget
 from editor.textwidget import TextWidget, EditorBar
-from utils import get_tesseract_languages
+import tessprobe
+import scannercache
 from utils import settings
+startup.mark('imports')
 
 __version__ = "1.0.0dev"
 
@@ -38,10 +47,13 @@ class Window(QMainWindow):
 	"""
 	ocrAvailable = True
 	thread = None
+	languages = []
 
 	def __init__(self, hasScanner=True):
 		QMainWindow.__init__(self)
 
+		self.hasScanner = hasScanner
+
 		self.curDir = ""
 		self.ui = Ui_Lector()
 		self.ui.setupUi(self)
@@ -79,12 +91,50 @@ class Window(QMainWindow):
 		self.ui.actionZoomIn.triggered.connect(self.ocrWidget.zoomIn)
 		self.ui.actionZoomOut.triggered.connect(self.ocrWidget.zoomOut)
 		self.ui.actionOcr.triggered.connect(self.ocrWidget.doOcr)
+		self.ui.actionDetectAreas.triggered.connect(self.ocrWidget.detectAreas)
+		self.ui.actionShowLowConfidence.toggled.connect(
+			self.ocrWidget.showLowConfidence)
 		self.ocrWidget.scene().changedSelectedAreaType.connect(
 			self.changedSelectedAreaType)
 
-		try:
-			languages = list(get_tesseract_languages())
-		except TypeError:  # tesseract is not installed
+		self.ui.rbtn_lang_select.currentIndexChanged.connect(
+			self.changeLanguage)
+		self.probeThread = None
+		self.discovery = None
+		startup.mark('UI setup')
+
+		#disable useless actions until a file has been opened
+		self.enableActions(False)
+
+		## load saved settings
+		self.readSettings()
+		startup.mark('settings read')
+
+		self.ui.actionScan.setEnabled(False)
+		if not self.statusBar().currentMessage():
+			self.statusBar().showMessage(self.tr("Ready"), 2000)
+
+	def finishStartup(self):
+		""" Startup work the window does not wait for, run once it is shown
+		"""
+		with startup.phase('tesseract probe'):
+			self.probeTesseract()
+		if self.hasScanner:
+			with startup.phase('SANE discovery'):
+				self.startScannerDiscovery()
+		startup.report()
+
+	def probeTesseract(self):
+		# the stored probe spares running tesseract at every start; a stale
+		# one is shown until the background probe has finished
+		probe = tessprobe.cached_probe()
+		if probe is None:
+			probe = tessprobe.cached_probe(stale=True)
+			if probe is None:
+				probe = tessprobe.probe()
+			else:
+				self.refreshProbe()
+		if probe is None:  # tesseract is not installed
 			# TODO: replace QMessageBox.warning with QErrorMessage (but we need
 			#	  to keep state
 			# dialog = QErrorMessage(self)
@@ -96,83 +146,41 @@ class Window(QMainWindow):
 			self.ocrAvailable = False
 			self.on_actionSettings_triggered(2)
 		else:
-			languages.sort()
-
-			languages_ext = {
-				'bul': self.tr('Bulgarian'),
-				'cat': self.tr('Catalan'),
-				'ces': self.tr('Czech'),
-				'chi_tra': self.tr('Chinese (Traditional)'),
-				'chi_sim': self.tr('Chinese (Simplified)'),
-				'dan': self.tr('Danish'),
-				'dan-frak': self.tr('Danish (Fraktur)'),
-				'nld': self.tr('Dutch'),
-				'eng': self.tr('English'),
-				'fin': self.tr('Finnish'),
-				'fra': self.tr('French'),
-				'deu': self.tr('German'),
-				'deu-frak': self.tr('German (Fraktur)'),
-				'ell': self.tr('Greek'),
-				'hun': self.tr('Hungarian'),
-				'ind': self.tr('Indonesian'),
-				'ita': self.tr('Italian'),
-				'jpn': self.tr('Japanese'),
-				'kor': self.tr('Korean'),
-				'lav': self.tr('Latvian'),
-				'lit': self.tr('Lithuanian'),
-				'nor': self.tr('Norwegian'),
-				'pol': self.tr('Polish'),
-				'por': self.tr('Portuguese'),
-				'ron': self.tr('Romanian'),
-				'rus': self.tr('Russian'),
-				'slk': self.tr('Slovak'),
-				'slk-frak': self.tr('Slovak (Fraktur)'),
-				'slv': self.tr('Slovenian'),
-				'spa': self.tr('Spanish'),
-				'srp': self.tr('Serbian'),
-				'swe': self.tr('Swedish'),
-				'swe-frak': self.tr('Swedish (Fraktur)'),
-				'tgl': self.tr('Tagalog'),
-				'tur': self.tr('Turkish'),
-				'ukr': self.tr('Ukrainian'),
-				'vie': self.tr('Vietnamese')
-				}
-
-			for lang in languages:
-				try:
-					lang_ext = languages_ext[lang]
-				except KeyError:
-					continue
-
-				self.ui.rbtn_lang_select.addItem(lang_ext, lang)
-				self.ui.rbtn_lang_select.currentIndexChanged.connect(
-					self.changeLanguage)
+			self.setLanguages(probe['languages'])
 
-		#disable useless actions until a file has been opened
-		self.enableActions(False)
-
-		## load saved settings
-		self.readSettings()
+	def startScannerDiscovery(self):
+		""" Enable the configured scanner if it was found last time, look
+		for scanners again if it was not or the list is old
+		"""
+		cached = scannercache.cached_devices()
+		if cached is not None:
+			devices, age = cached
+			if settings.get('scanner:device') in [x[0] for x in devices]:
+				self.scannerSelected()
+				if age < scannercache.DEVICES_TTL:
+					return
+		self.discoverScanners()
 
-		self.ui.actionScan.setEnabled(False)
-		if hasScanner:
-			self.on_actionChangeDevice_triggered()
-		if not self.statusBar().currentMessage():
-			self.statusBar().showMessage(self.tr("Ready"), 2000)
+	def discoverScanners(self):
+		""" Look for scanners in the background, see scannersFound
+		"""
+		if self.discovery is None:
+			self.discovery = scannercache.DeviceDiscovery(self)
+			self.discovery.discovered.connect(self.scannersFound)
+		self.discovery.start()
+		self.statusBar().showMessage(self.tr("Looking for scanners..."))
 
 	@pyqtSlot()
 	def on_actionChangeDevice_triggered(self):
-		##SANE
-		message = ''
-		try:
-			import sane
-		except ImportError:
+		self.discoverScanners()
+
+	def scannersFound(self, sane_list):
+		""" Devices found by SANE, None if SANE is not available
+		"""
+		if sane_list is None:
 			# sane found no scanner - disable scanning;
 			message = self.tr("Sane not found! Scanning is disabled.")
 		else:
-			from .scannerselect import ScannerSelect
-			sane.init()
-			sane_list = sane.get_devices()
 			saved_device = settings.get('scanner:device')
 			if saved_device in [x[0] for x in sane_list]:
 				message = self.tr("Sane found configured device...")
@@ -180,8 +188,12 @@ class Window(QMainWindow):
 			elif not sane_list:
 				message = self.tr("Sane dit not find any device! "
 								  "Scanning is disabled.")
+				self.ui.actionScan.setEnabled(False)
 			else:
 				# there is not configured device => run configuration
+				from .scannerselect import ScannerSelect
+				message = ''
+				self.ui.actionScan.setEnabled(False)
 				ss = ScannerSelect(sane_list, parent=self)
 				ss.accepted.connect(self.scannerSelected)
 				ss.show()
@@ -197,22 +209,36 @@ class Window(QMainWindow):
 			self.thread.scannedImage.connect(self.on_scannedImage)
 
 	def on_scannedImage(self):
-		self.ocrWidget.scene().im = self.thread.im
 		fn = self.tr("Unknown")
 		self.ocrWidget.filename = fn
-		self.ocrWidget.prepareDimensions()
+		self.ocrWidget.showPage(self.thread.im)
+		self.ocrWidget.scannedImage = self.thread.im
 		self.setWindowTitle("Lector: " + fn)
 		self.enableActions()
 
 	@pyqtSlot()
 	def on_actionSettings_triggered(self, tabIndex = 0):
+		from settingsdialog import Settings
+
 		settings_dialog = Settings(self, tabIndex)
 		settings_dialog.accepted.connect(self.updateTextEditor)
+		settings_dialog.accepted.connect(self.updateLowConfidence)
+		settings_dialog.accepted.connect(self.probeChanged)
 		settings_dialog.show()
 
 	def updateTextEditor(self):
 		self.textEditor.setEditorFont()
 
+	def probeChanged(self):
+		""" Executable or tessdata may have changed in settings
+		"""
+		if tessprobe.cached_probe() is None:
+			self.refreshProbe()
+
+	def updateLowConfidence(self):
+		self.ocrWidget.showLowConfidence(
+			self.ui.actionShowLowConfidence.isChecked())
+
 	@pyqtSlot()
 	def on_actionOpen_triggered(self):
 		fn, _ = QFileDialog.getOpenFileName(self,
@@ -228,14 +254,55 @@ class Window(QMainWindow):
 
 		self.enableActions(True)
 
+	@pyqtSlot()
+	def on_actionOpenProject_triggered(self):
+		# project brings numpy, not needed before the first project
+		from project import EXTENSION as PROJECT_EXTENSION
+
+		fn, _ = QFileDialog.getOpenFileName(self,
+				self.tr("Open project"), self.curDir,
+				self.tr("Lector project (*%s)") % PROJECT_EXTENSION
+			 )
+		if not fn: return
+
+		self.curDir = os.path.dirname(fn)
+		try:
+			self.ocrWidget.openProject(fn)
+		except (IOError, ValueError, KeyError) as err:
+			QMessageBox.warning(self, self.tr("Open project"), str(err))
+			return
+		index = self.ui.rbtn_lang_select.findData(self.ocrWidget.language)
+		if index >= 0:
+			self.ui.rbtn_lang_select.setCurrentIndex(index)
+		self.setWindowTitle("Lector: " + fn)
+
+		self.enableActions(True)
+
+	@pyqtSlot()
+	def on_actionSaveProject_triggered(self):
+		from project import EXTENSION as PROJECT_EXTENSION
+
+		fn, _ = QFileDialog.getSaveFileName(self,
+				self.tr("Save project"), self.curDir,
+				self.tr("Lector project (*%s)") % PROJECT_EXTENSION
+			 )
+		if not fn: return
+		if not fn.endswith(PROJECT_EXTENSION):
+			fn += PROJECT_EXTENSION
+
+		self.curDir = os.path.dirname(fn)
+		self.ocrWidget.saveProject(fn)
+
 	def enableActions(self, enable=True):
 		for action in (self.ui.actionRotateRight,
 					   self.ui.actionRotateLeft,
 					   self.ui.actionRotateFull,
 					   self.ui.actionZoomIn,
 					   self.ui.actionZoomOut,
+					   self.ui.actionDetectAreas,
 					   self.ui.actionSaveDocumentAs,
-					   self.ui.actionSaveImageAs,):
+					   self.ui.actionSaveImageAs,
+					   self.ui.actionSaveProject,):
 			action.setEnabled(enable)
 		self.ui.actionOcr.setEnabled(enable and self.ocrAvailable)
 
@@ -245,6 +312,88 @@ class Window(QMainWindow):
 		##TODO: check thread end before the submission of a new task
 		#self.thread.wait()
 
+	def setLanguages(self, languages):
+		""" Fill the language combo box, keeping the selected language
+		"""
+		languages_ext = {
+			'bul': self.tr('Bulgarian'),
+			'cat': self.tr('Catalan'),
+			'ces': self.tr('Czech'),
+			'chi_tra': self.tr('Chinese (Traditional)'),
+			'chi_sim': self.tr('Chinese (Simplified)'),
+			'dan': self.tr('Danish'),
+			'dan-frak': self.tr('Danish (Fraktur)'),
+			'nld': self.tr('Dutch'),
+			'eng': self.tr('English'),
+			'fin': self.tr('Finnish'),
+			'fra': self.tr('French'),
+			'deu': self.tr('German'),
+			'deu-frak': self.tr('German (Fraktur)'),
+			'ell': self.tr('Greek'),
+			'hun': self.tr('Hungarian'),
+			'ind': self.tr('Indonesian'),
+			'ita': self.tr('Italian'),
+			'jpn': self.tr('Japanese'),
+			'kor': self.tr('Korean'),
+			'lav': self.tr('Latvian'),
+			'lit': self.tr('Lithuanian'),
+			'nor': self.tr('Norwegian'),
+			'pol': self.tr('Polish'),
+			'por': self.tr('Portuguese'),
+			'ron': self.tr('Romanian'),
+			'rus': self.tr('Russian'),
+			'slk': self.tr('Slovak'),
+			'slk-frak': self.tr('Slovak (Fraktur)'),
+			'slv': self.tr('Slovenian'),
+			'spa': self.tr('Spanish'),
+			'srp': self.tr('Serbian'),
+			'swe': self.tr('Swedish'),
+			'swe-frak': self.tr('Swedish (Fraktur)'),
+			'tgl': self.tr('Tagalog'),
+			'tur': self.tr('Turkish'),
+			'ukr': self.tr('Ukrainian'),
+			'vie': self.tr('Vietnamese')
+			}
+
+		self.languages = sorted(languages)
+		combo = self.ui.rbtn_lang_select
+		current = self.ocrWidget.language
+		combo.blockSignals(True)
+		combo.clear()
+		for lang in sorted(languages):
+			try:
+				lang_ext = languages_ext[lang]
+			except KeyError:
+				continue
+
+			combo.addItem(lang_ext, lang)
+		index = combo.findData(current)
+		if index >= 0:
+			combo.setCurrentIndex(index)
+		combo.blockSignals(False)
+		if combo.count():
+			self.ocrWidget.language = combo.itemData(combo.currentIndex())
+
+	def refreshProbe(self):
+		""" Probe tesseract again in the background
+		"""
+		if self.probeThread and self.probeThread.isRunning():
+			return
+		self.probeThread = tessprobe.ProbeThread(self)
+		self.probeThread.probed.connect(self.updateProbe)
+		self.probeThread.start()
+
+	def updateProbe(self, probe):
+		""" New probe record from the background probe
+		"""
+		if probe is None:
+			return
+		if not self.ocrAvailable:
+			self.ocrAvailable = True
+			self.ui.actionOcr.setEnabled(self.ui.actionDetectAreas.isEnabled())
+		if sorted(probe['languages']) != self.languages:
+			self.setLanguages(probe['languages'])
+
 	def changeLanguage(self, row):
 		lang = self.sender().itemData(row)
 		self.ocrWidget.language = lang
@@ -308,6 +457,9 @@ class Window(QMainWindow):
 		""" Action before closing app
 		"""
 		if (not self.ocrWidget.scene().isModified) or self.areYouSureToExit():
+			self.ocrWidget.cancelOcr()
+			if self.probeThread:
+				self.probeThread.wait()
 			self.writeSettings()
 			event.accept()
 		else:
@@ -386,6 +538,11 @@ class Window(QMainWindow):
 
 ## MAIN
 def main():
+	if '--batch' in sys.argv[1:]:
+		# headless: no QApplication, no display
+		from batch import main as batch_main
+		sys.exit(batch_main([arg for arg in sys.argv[1:] if arg != '--batch']))
+
 	if settings.get('log:errors'):
 		log_filename = settings.get('log:filename')
 		if log_filename:
@@ -417,8 +574,12 @@ def main():
 	if qtTranslator.load(":/translations/ts/lector_" + locale, 'ts'):
 		app.installTranslator(qtTranslator)
 
+	startup.mark('application')
 	window = Window(scanner)
 	window.show()
+	startup.shown()
+	# after the first paint
+	QTimer.singleShot(0, window.finishStartup)
 	app.exec()
 
 if __name__ == "__main__":
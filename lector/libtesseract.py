@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: libtesseract.py
+
+    ctypes binding of the tesseract C API (capi.h). Initialized
+    TessBaseAPI handles are kept per language for the life of the
+    application, so the .traineddata models are loaded only once.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import os
+import sys
+import ctypes
+import ctypes.util
+import threading
+
+from utils import settings
+
+
+class TessError(Exception):
+    """ libtesseract failed to initialize or to recognize an image
+    """
+    pass
+
+
+## bool cancel(void *cancel_this, int words), polled while recognizing
+TessCancelFunc = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_int)
+
+
+def _library_names():
+    names = [ctypes.util.find_library('tesseract')]
+    if sys.platform == 'win32':
+        names += ['libtesseract-5.dll', 'libtesseract-4.dll',
+                  'tesseract50.dll', 'tesseract41.dll']
+    elif sys.platform == 'darwin':
+        names += ['libtesseract.5.dylib', 'libtesseract.4.dylib']
+    else:
+        names += ['libtesseract.so.5', 'libtesseract.so.4']
+    return [name for name in names if name]
+
+
+def _datapath():
+    """ tessdata directory from settings (as bytes) or None for default
+    """
+    prefix = settings.get('tesseract-ocr:TESSDATA_PREFIX')
+    if not prefix:
+        return None
+    # setting is documented without 'tessdata', tesseract >= 4 wants it
+    tessdata = os.path.join(prefix, 'tessdata')
+    if os.path.isdir(tessdata):
+        prefix = tessdata
+    return prefix.encode(sys.getfilesystemencoding())
+
+
+class TessLibrary(object):
+    """ Persistent TessBaseAPI handles on top of loaded libtesseract
+
+    A TessBaseAPI may be used only by one thread at a time. Idle handles
+    are kept per language; a worker takes one (or initializes a new one
+    if all are busy) and gives it back after recognition.
+    """
+    def __init__(self, lib):
+        self.lib = lib
+        self.datapath = _datapath()
+        self._idle = {}
+        self._lock = threading.Lock()
+
+        lib.TessVersion.restype = ctypes.c_char_p
+        lib.TessVersion.argtypes = []
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPICreate.argtypes = []
+        lib.TessBaseAPIInit3.restype = ctypes.c_int
+        lib.TessBaseAPIInit3.argtypes = [ctypes.c_void_p, ctypes.c_char_p,
+                                         ctypes.c_char_p]
+        lib.TessBaseAPISetImage.restype = None
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_char_p,
+                                            ctypes.c_int, ctypes.c_int,
+                                            ctypes.c_int, ctypes.c_int]
+        lib.TessBaseAPISetPageSegMode.restype = None
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p,
+                                                  ctypes.c_int]
+        lib.TessBaseAPIGetPageSegMode.restype = ctypes.c_int
+        lib.TessBaseAPIGetPageSegMode.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPISetSourceResolution.restype = None
+        lib.TessBaseAPISetSourceResolution.argtypes = [ctypes.c_void_p,
+                                                       ctypes.c_int]
+        lib.TessMonitorCreate.restype = ctypes.c_void_p
+        lib.TessMonitorCreate.argtypes = []
+        lib.TessMonitorSetCancelFunc.restype = None
+        lib.TessMonitorSetCancelFunc.argtypes = [ctypes.c_void_p,
+                                                 TessCancelFunc]
+        lib.TessMonitorDelete.restype = None
+        lib.TessMonitorDelete.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIRecognize.restype = ctypes.c_int
+        lib.TessBaseAPIRecognize.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        # c_void_p, because the string has to be freed by TessDeleteText
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        lib.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetHOCRText.restype = ctypes.c_void_p
+        lib.TessBaseAPIGetHOCRText.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPIGetTsvText.restype = ctypes.c_void_p
+        lib.TessBaseAPIGetTsvText.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessDeleteText.restype = None
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetAvailableLanguagesAsVector.restype = \
+            ctypes.POINTER(ctypes.c_char_p)
+        lib.TessBaseAPIGetAvailableLanguagesAsVector.argtypes = [
+            ctypes.c_void_p]
+        lib.TessDeleteTextArray.restype = None
+        lib.TessDeleteTextArray.argtypes = [ctypes.POINTER(ctypes.c_char_p)]
+        lib.TessBaseAPIClear.restype = None
+        lib.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.restype = None
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIDelete.restype = None
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+
+    def version(self):
+        return self.lib.TessVersion().decode('ascii')
+
+    def _init(self, lang):
+        handle = self.lib.TessBaseAPICreate()
+        language = lang.encode('ascii') if lang else None
+        if self.lib.TessBaseAPIInit3(handle, self.datapath, language):
+            self.lib.TessBaseAPIDelete(handle)
+            raise TessError("Could not initialize tesseract for '%s'" % lang)
+        return handle
+
+    def _acquire(self, lang):
+        with self._lock:
+            idle = self._idle.setdefault(lang, [])
+            if idle:
+                return idle.pop()
+        return self._init(lang)
+
+    def _release(self, lang, handle):
+        self.lib.TessBaseAPIClear(handle)
+        with self._lock:
+            self._idle[lang].append(handle)
+
+    def _recognize(self, handle, cancelled):
+        """ Run recognition with a monitor polling cancelled() (a callable
+        returning True to stop); the text getters reuse its result
+        """
+        # referenced until the library returns, ctypes does not keep it
+        callback = TessCancelFunc(lambda cancel_this, words: cancelled())
+        monitor = self.lib.TessMonitorCreate()
+        try:
+            self.lib.TessMonitorSetCancelFunc(monitor, callback)
+            if self.lib.TessBaseAPIRecognize(handle, monitor):
+                raise TessError("Tesseract could not recognize the image")
+        finally:
+            self.lib.TessMonitorDelete(monitor)
+
+    def recognize(self, region, lang, dpi=300, output='txt', psm=None,
+                  cancelled=None):
+        """ Recognize PIL image; pixels are passed without any encoding
+
+        output is 'txt' (plain text), 'hocr' or 'tsv'; psm is the page
+        segmentation mode, None keeps the default of the handle.
+        cancelled() is polled while recognizing, returning True stops
+        recognition with TessError.
+        """
+        if region.mode not in ('L', 'RGB'):
+            region = region.convert('L')
+        bpp = len(region.getbands())
+        width, height = region.size
+
+        handle = self._acquire(lang)
+        # handles are shared, the mode is set back after recognition
+        defaultPsm = self.lib.TessBaseAPIGetPageSegMode(handle)
+        try:
+            if psm is not None:
+                self.lib.TessBaseAPISetPageSegMode(handle, psm)
+            self.lib.TessBaseAPISetImage(handle, region.tobytes(), width,
+                                         height, bpp, width * bpp)
+            self.lib.TessBaseAPISetSourceResolution(handle, dpi)
+            if cancelled is not None:
+                self._recognize(handle, cancelled)
+            if output == 'hocr':
+                text_ptr = self.lib.TessBaseAPIGetHOCRText(handle, 0)
+            elif output == 'tsv':
+                text_ptr = self.lib.TessBaseAPIGetTsvText(handle, 0)
+            else:
+                text_ptr = self.lib.TessBaseAPIGetUTF8Text(handle)
+            if not text_ptr:
+                raise TessError("Tesseract could not recognize the image")
+            try:
+                text = ctypes.string_at(text_ptr).decode('utf-8', 'replace')
+            finally:
+                self.lib.TessDeleteText(text_ptr)
+        finally:
+            if psm is not None:
+                self.lib.TessBaseAPISetPageSegMode(handle, defaultPsm)
+            self._release(lang, handle)
+        return text
+
+    def languages(self):
+        """ List of languages available in the tessdata directory
+        """
+        handle = self._init(None)
+        try:
+            vector = self.lib.TessBaseAPIGetAvailableLanguagesAsVector(handle)
+            langs = []
+            i = 0
+            while vector[i]:
+                langs.append(vector[i].decode('utf-8'))
+                i += 1
+            self.lib.TessDeleteTextArray(vector)
+        finally:
+            self.lib.TessBaseAPIEnd(handle)
+            self.lib.TessBaseAPIDelete(handle)
+        return langs
+
+
+_library = None
+_library_lock = threading.Lock()
+
+def load():
+    """ Return shared TessLibrary or None if libtesseract is not available
+    """
+    global _library
+
+    with _library_lock:
+        if _library is None:
+            _library = False
+            for name in _library_names():
+                try:
+                    _library = TessLibrary(ctypes.CDLL(name))
+                except (OSError, AttributeError):
+                    continue
+                break
+    return _library or None
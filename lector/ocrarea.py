@@ -13,7 +13,7 @@
 from PyQt6.QtGui import QPen, QFont, QColor
 from PyQt6.QtCore import Qt, QObject, pyqtSignal
 from PyQt6.QtWidgets import (QApplication as QA, QMenu, QGraphicsItem,
-                             QGraphicsTextItem, QGraphicsRectItem)
+                             QGraphicsRectItem, QStyle)
 
 
 class IsClicked(QObject):
@@ -27,11 +27,17 @@ class IsClicked(QObject):
 
 
 class OcrArea(QGraphicsRectItem):
+    """ View of one row of OcrScene.store
+
+    Border and label style is shared by all the areas (setStyle); the label
+    is the row number and is painted only if it fits into the area.
+    """
     ## static data
     resizeBorder = .0
+    borderWidth = 2.
+    labelFont = None
 
-    def __init__(self, pos, size, type_, parent = None, scene = None,
-                 areaBorder = 2, index = 0, textSize = 50):
+    def __init__(self, pos, size, type_, parent = None):
         QGraphicsRectItem.__init__(self, 0, 0, size.width(), size.height(),
                                    parent)
         self.setPos(pos)
@@ -42,31 +48,64 @@ class OcrArea(QGraphicsRectItem):
 		# was QGraphicsItem.Attribute
         self.setFlags(QGraphicsItem.GraphicsItemFlag.ItemIsMovable |
             QGraphicsItem.GraphicsItemFlag.ItemIsFocusable |
-            QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
-
-        ## set index label
-        self.text = QGraphicsTextItem("%d" % index, self)
-        self.setTextSize(textSize)
+            QGraphicsItem.GraphicsItemFlag.ItemIsSelectable |
+            QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
 
         ## TODO: How to create constants for the type?
         ## (such as constants in Qt) (enum?)
         self.kind = type_
-
-		# was Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin
-        pen = QPen(self.color, areaBorder, Qt.PenStyle.SolidLine,
-                   Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
-        self.setPen(pen)
         # self.setAcceptsHoverEvents(True)  # TODO
 
-        # self.text.setFlag(QtGui.QGraphicsItem.ItemIgnoresTransformations)
+    @staticmethod
+    def setStyle(borderWidth, textSize):
+        """ Border width and label size (scene units) of all the areas
 
-    def setIndex(self, idx):
-        self.text.setPlainText(str(idx))
-
-    def setTextSize(self, size):
+        Callers have to prepareGeometryChange() the areas before.
+        """
+        OcrArea.borderWidth = borderWidth
         font = QFont()
-        font.setPointSizeF(size)
-        self.text.setFont(font)
+        font.setPointSizeF(textSize)
+        OcrArea.labelFont = font
+
+    def boundingRect(self):
+        half = OcrArea.borderWidth / 2.
+        return self.rect().adjusted(-half, -half, half, half)
+
+    def paint(self, painter, option, widget=None):
+		# was Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin
+        style = Qt.PenStyle.SolidLine
+        if option.state & QStyle.StateFlag.State_Selected:
+            style = Qt.PenStyle.DashLine
+        painter.setPen(QPen(self.color, OcrArea.borderWidth, style,
+                            Qt.PenCapStyle.RoundCap,
+                            Qt.PenJoinStyle.RoundJoin))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        r = self.rect()
+        painter.drawRect(r)
+
+        # level of detail: skip labels of areas too small to hold them
+        font = OcrArea.labelFont
+        if font is None or not self.scene():
+            return
+        size = font.pointSizeF() * 2
+        if r.height() < size or r.width() < size:
+            return
+        painter.setFont(font)
+        painter.drawText(r, Qt.AlignmentFlag.AlignLeft |
+                         Qt.AlignmentFlag.AlignTop,
+                         " %d" % (self.scene().store.row(self) + 1))
+
+    def setRect(self, *args):
+        QGraphicsRectItem.setRect(self, *args)
+        if self.scene():
+            self.scene().areaMoved(self)
+
+    def itemChange(self, change, value):
+        # keeps the spatial index of the scene up to date
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged \
+                and self.scene():
+            self.scene().areaMoved(self)
+        return QGraphicsRectItem.itemChange(self, change, value)
 
     def contextMenuEvent(self, event):
         menu = QMenu()
@@ -111,11 +150,9 @@ class OcrArea(QGraphicsRectItem):
         else:  ## TODO: else -> elif ... + else raise exception
             self.color = QColor(Qt.GlobalColor.blue)
 
-        self.text.setDefaultTextColor(self.color)
-
-        pen = self.pen()
-        pen.setColor(self.color)
-        self.setPen(pen)
+        if self.scene():
+            self.scene().store.setKind(self, type_)
+        self.update()
 
     def _type(self):
         return self.__type
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: ocrcache.py
+
+    Persistent cache of recognized text. Entries are addressed by a hash
+    of the cropped region pixels together with the language, engine
+    version and preprocessing, so any change of these makes a new entry.
+    The cache is a SQLite database, which takes care of locking when
+    several Lector processes share it.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+from PyQt6.QtCore import QStandardPaths
+
+from utils import settings
+
+
+def default_path():
+    cache_dir = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(cache_dir, 'lector', 'ocr-cache.sqlite')
+
+
+class OcrCache(object):
+    """ Size bounded LRU cache of OCR results
+
+    Must be used from one thread only (SQLite connection).
+    """
+    def __init__(self, path=None, maxSize=64 * 1024 * 1024):
+        if path is None:
+            path = default_path()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.maxSize = maxSize
+
+        self.db = sqlite3.connect(path, timeout=10, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS results ('
+                        'key TEXT PRIMARY KEY, text TEXT NOT NULL, '
+                        'size INTEGER NOT NULL, atime REAL NOT NULL)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_atime '
+                        'ON results (atime)')
+
+    @staticmethod
+    def key(region, lang, engineVersion, preprocessing):
+        """ Content address of a cropped (not yet preprocessed) region
+        """
+        digest = hashlib.sha1()
+        digest.update(('%s %dx%d\n' % ((region.mode,) + region.size))
+                      .encode('ascii'))
+        digest.update(region.tobytes())
+        digest.update(('\n%s\n%s\n%s' % (lang, engineVersion, preprocessing))
+                      .encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """ Cached text or None; a hit refreshes the entry
+        """
+        row = self.db.execute('SELECT text FROM results WHERE key = ?',
+                              (key,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute('UPDATE results SET atime = ? WHERE key = ?',
+                        (time.time(), key))
+        return row[0]
+
+    def put(self, key, text):
+        self.db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                        (key, text, len(text.encode('utf-8')), time.time()))
+
+    def evict(self):
+        """ Remove least recently used entries over the size limit
+        """
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            total = self.db.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            if total > self.maxSize:
+                oldest = self.db.execute('SELECT key, size FROM results '
+                                         'ORDER BY atime').fetchall()
+                expired = []
+                for key, size in oldest:
+                    if total <= self.maxSize:
+                        break
+                    expired.append((key,))
+                    total -= size
+                self.db.executemany('DELETE FROM results WHERE key = ?',
+                                    expired)
+        finally:
+            self.db.execute('COMMIT')
+
+
+## one connection per thread, every OCR job runs in a new thread
+_local = threading.local()
+
+def get_cache():
+    """ Cache of the calling thread or None if caching is disabled in
+    settings
+    """
+    if not settings.get('ocr:cache'):
+        return None
+    maxSize = settings.get('ocr:cacheSize') * 1024 * 1024
+    cache = getattr(_local, 'cache', None)
+    if cache is None:
+        try:
+            cache = _local.cache = OcrCache(maxSize=maxSize)
+        except sqlite3.Error as ex:
+            print("OCR cache is not available:", ex)
+            return None
+    cache.maxSize = maxSize
+    return cache
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: ocrengine.py
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import io
+import os
+import threading
+from collections import namedtuple
+from subprocess import Popen, PIPE, STDOUT
+import numpy as np
+from PIL import Image
+
+from layout import x_height
+from tessprobe import cached_probe
+from utils import settings
+import libtesseract
+from libtesseract import TessError
+
+
+## result of one area; index is the position of the area in OcrScene.areas,
+## words are ocrwords.Words for areas recognized with TSV output
+OcrResult = namedtuple('OcrResult', 'index text returncode error words',
+                       defaults=(None,))
+
+CANCELLED = 'Cancelled'
+
+
+def tesseract_executable():
+    """ Return configured tesseract executable
+    """
+    tess_exec = settings.get('tesseract-ocr:executable')
+    if not tess_exec:
+        tess_exec = 'tesseract'
+    return tess_exec
+
+
+def tesseract_environment(workers):
+    """ Environment for tesseract processes running side by side.
+
+    Tesseract (>= 4) spreads one page over all cores with OpenMP; with
+    several processes running at once this only oversubscribes the CPU.
+    """
+    env = dict(os.environ)
+    if workers > 1:
+        env['OMP_THREAD_LIMIT'] = '1'
+    return env
+
+
+## resolution range where tesseract works best; pages outside of it are
+## resampled to TARGET_DPI
+OPTIMAL_DPI = (250, 600)
+TARGET_DPI = 300
+## the same for pages without resolution, by x-height in pixels
+## (10 pt text at 300 dpi has x-height of about 20 px)
+OPTIMAL_X_HEIGHT = (14, 40)
+TARGET_X_HEIGHT = 20
+
+
+def text_scale(page, gray=None):
+    """ (scale, dpi) for text areas of PIL page
+
+    Resolution from image metadata is used when it is plausible (JPEGs
+    often claim 72 dpi), otherwise it is estimated from the x-height of the
+    text. dpi is the resolution of the scaled areas, as told to tesseract.
+    gray is the page as uint8 array, if there is one already.
+    """
+    dpi = page.info.get('dpi')
+    if dpi and dpi[0] >= 100:
+        dpi = float(dpi[0])
+        if OPTIMAL_DPI[0] <= dpi <= OPTIMAL_DPI[1]:
+            return 1., int(round(dpi))
+        return TARGET_DPI / dpi, TARGET_DPI
+
+    if gray is None:
+        gray = np.asarray(page.convert('L'))
+    height = x_height(gray)
+    if not height:
+        return 1., TARGET_DPI
+    dpi = int(round(TARGET_DPI * height / TARGET_X_HEIGHT))
+    if OPTIMAL_X_HEIGHT[0] <= height <= OPTIMAL_X_HEIGHT[1]:
+        return 1., dpi
+    return TARGET_X_HEIGHT / height, TARGET_DPI
+
+
+def prepare_text_region(region, scale=1.):
+    """ Improve quality of text area for tesseract
+
+    Regions come from the grayscale page, so only one channel is resampled.
+    Any change here has to be reflected in preprocessing() (cache key).
+    """
+    if scale != 1.:
+        nx, ny = region.size
+        region = region.resize((max(1, int(round(nx * scale))),
+                                max(1, int(round(ny * scale)))),
+                               Image.BICUBIC)
+    return region.convert('L')
+
+
+def preprocessing(scale=1.):
+    """ Description of prepare_text_region for the OCR cache key
+
+    >>> preprocessing(1.5)
+    'resize:1.5,bicubic;L'
+    """
+    if scale == 1.:
+        return 'L'
+    return 'resize:%.4g,bicubic;L' % scale
+
+
+_versions = {}
+
+def tesseract_version(tess_exec):
+    """ First line of 'tesseract --version', cached per executable; the
+    stored probe of the configured executable saves running it
+    """
+    if tess_exec not in _versions and tess_exec == tesseract_executable():
+        probe = cached_probe()
+        if probe:
+            _versions[tess_exec] = probe['version']
+    if tess_exec not in _versions:
+        try:
+            output = Popen([tess_exec, '--version'], shell=False,
+                           stdout=PIPE, stderr=STDOUT).communicate()[0]
+            _versions[tess_exec] = output.decode('utf-8', 'replace') \
+                .strip().split('\n')[0]
+        except OSError:
+            _versions[tess_exec] = ''
+    return _versions[tess_exec]
+
+
+def encode_region(region, dpi=TARGET_DPI):
+    """ Encode PIL image for tesseract's stdin
+
+    PNG keeps the resolution; the lowest compression level is used because
+    the data only travels through a pipe.
+    """
+    buf = io.BytesIO()
+    region.save(buf, 'PNG', dpi=(dpi, dpi), compress_level=1)
+    return buf.getvalue()
+
+
+def run_tesseract(index, tess_exec, region, lang, env=None, dpi=TARGET_DPI,
+                  output='txt', started=None, psm=None):
+    """ Stream region to tesseract (stdin) and read text from its stdout
+
+    output is 'txt' (plain text), 'hocr' or 'tsv'. Waits for the process itself,
+    so the result is complete when this returns. Is called from worker
+    threads of the OCR pool, so it must not touch any Qt object.
+    started(process) is called as soon as the process runs. psm is the
+    page segmentation mode, None for tesseract's default.
+    """
+    command = [tess_exec, '-', '-', '-l', lang]
+    if psm is not None:
+        command += ['--psm', str(psm)]
+    if output != 'txt':
+        command.append(output)
+    try:
+        process = Popen(command,
+                        shell=False, stdin=PIPE, stdout=PIPE, stderr=PIPE,
+                        env=env)
+        if started:
+            started(process)
+        text, error = process.communicate(encode_region(region, dpi))
+    except OSError as ex:
+        return OcrResult(index, '', -1, str(ex))
+
+    return OcrResult(index, text.decode('utf-8', 'replace'),
+                     process.returncode, error.decode('utf-8', 'replace'))
+
+
+def recognize_area(engine, index, region, lang, output='txt', scale=1.,
+                   dpi=TARGET_DPI, psm=None):
+    """ Preprocess cropped text area and recognize it (in a worker thread)
+    """
+    return engine.recognize(index, prepare_text_region(region, scale), lang,
+                            output, dpi, psm)
+
+
+class CliEngine(object):
+    """ Runs one tesseract process per area
+    """
+    name = 'cli'
+
+    def __init__(self, workers=1):
+        self.tess_exec = tesseract_executable()
+        self.env = tesseract_environment(workers)
+        self.cancelled = False
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def version(self):
+        return tesseract_version(self.tess_exec)
+
+    def _started(self, process):
+        with self._lock:
+            self._processes.add(process)
+            if self.cancelled:
+                process.kill()
+
+    def recognize(self, index, region, lang, output='txt', dpi=TARGET_DPI,
+                  psm=None):
+        if self.cancelled:
+            return OcrResult(index, '', -1, CANCELLED)
+        processes = []
+
+        def started(process):
+            processes.append(process)
+            self._started(process)
+
+        result = run_tesseract(index, self.tess_exec, region, lang, self.env,
+                               dpi, output, started, psm)
+        with self._lock:
+            self._processes.difference_update(processes)
+        if self.cancelled:
+            return OcrResult(index, '', -1, CANCELLED)
+        return result
+
+    def cancel(self):
+        """ Kill running tesseract processes, do not start new ones
+        """
+        with self._lock:
+            self.cancelled = True
+            for process in self._processes:
+                try:
+                    process.kill()
+                except OSError:
+                    pass
+
+
+class LibraryEngine(object):
+    """ Recognizes areas in-process with libtesseract
+    """
+    name = 'library'
+
+    def __init__(self, library):
+        self.library = library
+        self.cancelled = False
+
+    def version(self):
+        return 'libtesseract ' + self.library.version()
+
+    def recognize(self, index, region, lang, output='txt', dpi=TARGET_DPI,
+                  psm=None):
+        if self.cancelled:
+            return OcrResult(index, '', -1, CANCELLED)
+        try:
+            text = self.library.recognize(region, lang, dpi, output, psm,
+                                          lambda: self.cancelled)
+        except TessError as ex:
+            if self.cancelled:
+                return OcrResult(index, '', -1, CANCELLED)
+            return OcrResult(index, '', -1, str(ex))
+        return OcrResult(index, text, 0, '')
+
+    def cancel(self):
+        """ Stop recognition running in the library, do not start new areas
+        """
+        self.cancelled = True
+
+
+def get_engine(workers=1):
+    """ Engine selected in settings ('tesseract-ocr:engine')
+
+    'auto' (default) prefers libtesseract and falls back to the
+    tesseract executable when the library is missing.
+    """
+    engine = settings.get('tesseract-ocr:engine')
+    if engine != 'cli':
+        if workers > 1:
+            # must be set before OpenMP in libtesseract starts
+            os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+        library = libtesseract.load()
+        if library:
+            return LibraryEngine(library)
+        if engine == 'library':
+            print("libtesseract was not found, using tesseract executable.")
+    return CliEngine(workers)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: ocrjob.py
+
+    OCR of the areas of one page in a worker thread. Text areas are
+    recognized by a pool of threads with TSV output, so that every result
+    has its words with boxes and confidences; results reach the GUI through
+    signals, in the order of the areas. With 'ocr:refine' set, the weak
+    lines of every text area get a second pass (refine.py). Text areas are
+    classified first: blank ones are skipped, pictures are saved as
+    pictures ('ocr:classify'). Tall text areas are split into horizontal
+    strips recognized side by side and joined again. Areas whose content key did not change since
+    the previous run keep their previous result.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ocrengine import OcrResult, get_engine, preprocessing, recognize_area
+from ocrcache import OcrCache, get_cache
+from ocrwords import parse_tsv, join_words
+from layout import BLANK, classify_region, clip_box, text_strips
+from preprocess import selected_stages, format_timing
+from project import area_key
+from refine import VARIANTS, refine_words, format_stats
+from utils import settings
+
+## text areas taller than this (pixels, as passed to tesseract) are split
+## into strips, one per worker at most
+STRIP_HEIGHT = 600
+
+
+class OcrJob(QThread):
+    """ Recognizes areas [(area id, box, kind)] of OcrPage page
+
+    previous maps area ids to (key, text) of the previous run.
+
+    The page must not change while the job runs. cancel() may be called
+    from the GUI thread at any time; running tesseract processes are
+    killed and no other area is started.
+    """
+    ## OcrResult and content key of each area, in order of areas
+    areaDone = pyqtSignal(object, str)
+    ## area index and kind, for text areas found to be pictures
+    kindDetected = pyqtSignal(int, int)
+    ## number of areas done
+    progress = pyqtSignal(int)
+    ## list of messages for the status bar, emitted once at the end
+    summary = pyqtSignal(list)
+
+    def __init__(self, page, areas, lang, previous=None, parent=None):
+        QThread.__init__(self, parent)
+        self.page = page
+        self.areas = areas
+        self.lang = lang
+        self.previous = previous or {}
+        self.engine = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.engine:
+            self.engine.cancel()
+
+    def _words(self, result, box, scale):
+        """ Result with words parsed from its TSV and their plain text
+        """
+        if result.returncode:
+            return result
+        words = parse_tsv(result.text, scale, box[:2])
+        return result._replace(text=words.text(), words=words)
+
+    def _strips(self, page, box, scale, workers):
+        """ [(box, own top, own bottom)] of the strips of text area box
+        """
+        left, top, right, bottom = box
+        count = min(workers, int((bottom - top) * scale / STRIP_HEIGHT))
+        if count < 2:
+            return [(box, top, bottom)]
+        gray = np.asarray(page.crop(box))
+        return [((left, top + stripTop, right, top + stripBottom),
+                 top + ownTop, top + ownBottom)
+                for stripTop, stripBottom, ownTop, ownBottom
+                in text_strips(gray, count)]
+
+    def _recognize(self, i, box, region, page, scale, dpi, threshold,
+                   variants):
+        """ Recognize text area (or its strip) and refine its weak lines
+        (worker thread), returns (box, result, seconds of first pass,
+        RefineStats or None)
+        """
+        start = time.time()
+        result = self._words(recognize_area(self.engine, i, region,
+                                            self.lang, 'tsv', scale, dpi),
+                             box, scale)
+        seconds = time.time() - start
+        if threshold is None or result.words is None:
+            return box, result, seconds, None
+        words, stats = refine_words(self.engine, page, result.words,
+                                    self.lang, threshold, scale, dpi,
+                                    variants)
+        if stats.improved:
+            result = result._replace(text=words.text(), words=words)
+        return box, result, seconds, stats
+
+    def run(self):
+        workers = settings.get('tesseract-ocr:workers')
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            messages = self._ocr(pool, workers)
+        except Exception as ex:
+            # a failing worker, cache or engine must not end the thread
+            # without a word; areas done so far stay in the editor
+            import traceback
+            traceback.print_exc()
+            messages = [self.tr("OCR failed: %s") % ex]
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.summary.emit(messages)
+
+    def _ocr(self, pool, workers):
+        """ Recognize the areas, returns the messages of the summary
+        """
+        self.engine = get_engine(workers)
+        if self.cancelled:
+            self.engine.cancel()
+        cache = get_cache()
+        if cache:
+            engineVersion = self.engine.version()
+        cacheKeys = {}
+        cacheHits = 0
+        areaKeys = []
+        # boxes clipped to the page, words are relative to them
+        areaBoxes = []
+        unchanged = 0
+
+        # pixel stages run once per page image (and are kept for the next
+        # run), text areas are cropped from the result; pictures keep the
+        # original colours
+        timing = {}
+        stages = selected_stages()
+        page = self.page.ocrImage(stages, timing)
+        if timing:
+            print("Preprocessing: " + format_timing(timing))
+        gray = self.page.gray()
+        scale, dpi = self.page.textScale()
+
+        threshold = None
+        output = 'tsv'
+        if settings.get('ocr:refine'):
+            threshold = settings.get('ocr:lowConfidence')
+            output += ';refine:%d' % threshold
+        # the page may be binarized already
+        variants = [variant for variant in VARIANTS
+                    if variant[2] not in stages]
+        firstPass = 0.
+        refineStats = []
+        classify = settings.get('ocr:classify')
+        blank = 0
+        pictures = 0
+
+        # results are kept until all the areas before them are done, so the
+        # editor gets them in order
+        results = {}
+        pending = set()
+        # words of the strips of split areas, until all of them are done
+        strips = {}
+        resolved = set()
+
+        height, width = gray.shape
+        for i, (areaId, box, kind) in enumerate(self.areas):
+            # only the part of the area on the page counts
+            box = clip_box(box, width, height)
+            left, top, right, bottom = box
+            areaBoxes.append(box)
+            grayRegion = gray[top:bottom, left:right]
+            key = area_key(grayRegion, box, kind, self.lang)
+            areaKeys.append(key)
+            previous = self.previous.get(areaId)
+            if previous and previous[0] == key:
+                results[i] = OcrResult(i, previous[1], 0, '')
+                unchanged += 1
+                continue
+            if not grayRegion.size:
+                results[i] = OcrResult(i, '', 0, '')
+                blank += 1
+                continue
+
+            if kind == 1 and classify:
+                kind = classify_region(grayRegion)
+                if kind == BLANK:
+                    results[i] = OcrResult(i, '', 0, '')
+                    blank += 1
+                    continue
+                if kind == 2:
+                    # the area becomes a picture, its key has to follow
+                    areaKeys[i] = area_key(grayRegion, box, kind, self.lang)
+                    self.kindDetected.emit(i, kind)
+                    pictures += 1
+
+            if kind == 1:
+                region = page.crop(box)
+                if cache:
+                    cacheKey = OcrCache.key(region, self.lang, engineVersion,
+                                            preprocessing(scale) + ';' +
+                                            output)
+                    text = cache.get(cacheKey)
+                    if text is not None:
+                        # cached words are relative to the area, unscaled
+                        results[i] = self._words(OcrResult(i, text, 0, ''),
+                                                 box, 1.)
+                        cacheHits += 1
+                        continue
+                    cacheKeys[i] = cacheKey
+                areaStrips = self._strips(page, box, scale, workers)
+                print("Area %d: scale %.2f, %d dpi, %d strip(s)"
+                      % (i + 1, scale, dpi, len(areaStrips)))
+                if len(areaStrips) > 1:
+                    strips[i] = dict((stripBox, (None, top, bottom))
+                                     for stripBox, top, bottom in areaStrips)
+                for stripBox, _, _ in areaStrips:
+                    pending.add(pool.submit(
+                        self._recognize, i, stripBox, page.crop(stripBox),
+                        page, scale, dpi, threshold, variants))
+            else:
+                region = self.page.im.crop(box)
+                # TODO: make random filename if we do not debug lector ;-)
+                tempPath = "tmp"
+                filename = tempPath + "/out.%d.png" % areaId
+                if not os.path.exists(tempPath):
+                    os.makedirs(tempPath)
+                region = region.resize((int(region.size[0]/4),
+                                        int(region.size[1]/4)))
+                region.save(filename)
+
+                results[i] = OcrResult(i, "<img src='%s'>" % filename, 0, '')
+
+        nextItem = 0
+        failed = []
+        while nextItem < len(self.areas) and not self.cancelled:
+            if pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stripBox, result, seconds, stats = future.result()
+                    firstPass += seconds
+                    if stats:
+                        refineStats.append(stats)
+                    i = result.index
+                    if i in resolved:
+                        # another strip of the area failed
+                        continue
+                    if i in strips and not result.returncode:
+                        _, top, bottom = strips[i][stripBox]
+                        strips[i][stripBox] = (result.words, top, bottom)
+                        parts = sorted(strips[i].values(),
+                                       key=lambda part: part[1])
+                        if any(words is None for words, _, _ in parts):
+                            continue
+                        del strips[i]
+                        words = join_words(parts)
+                        result = result._replace(text=words.text(),
+                                                 words=words)
+                    resolved.add(i)
+                    if i in cacheKeys and not result.returncode:
+                        cache.put(cacheKeys[i],
+                                  result.words.tsv(areaBoxes[i][:2]))
+                    results[i] = result
+
+            while nextItem in results and not self.cancelled:
+                result = results.pop(nextItem)
+                if result.returncode:
+                    ## TODO: mark area as problematic
+                    print("Tesseract was unabled to process area %d! "
+                          "(exit code %d)\n%s" % (nextItem + 1,
+                          result.returncode, result.error))
+                    failed.append(str(nextItem + 1))
+                self.areaDone.emit(result, areaKeys[nextItem])
+                nextItem += 1
+            self.progress.emit(nextItem)
+
+        messages = []
+        if self.cancelled:
+            messages.append(self.tr("OCR aborted after %d of %d area(s)")
+                            % (nextItem, len(self.areas)))
+        if failed:
+            messages.append(self.tr("Tesseract failed on area(s): %s")
+                            % ', '.join(failed))
+        if refineStats:
+            messages.append(self.tr("Refinement: %s")
+                            % format_stats(refineStats, firstPass))
+        if blank or pictures:
+            messages.append(self.tr("Skipped %d blank area(s), %d picture(s)")
+                            % (blank, pictures))
+        if unchanged:
+            messages.append(self.tr("%d unchanged area(s) kept")
+                            % unchanged)
+        if cache:
+            cache.evict()
+            lookups = cacheHits + len(cacheKeys)
+            if lookups:
+                messages.append(self.tr("OCR cache hits: %d/%d (%d%%)")
+                                % (cacheHits, lookups,
+                                   100 * cacheHits / lookups))
+        if timing:
+            messages.append(self.tr("Preprocessing: %s")
+                            % format_timing(timing))
+        return messages
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: ocrpage.py
+
+    Working representations of the page shown: grayscale and the OCR
+    image (grayscale after the pixel stages) are made once per image and
+    shared by all the areas and all the OCR runs. OcrScene makes a new
+    OcrPage whenever its image changes (open, scan, rotation).
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import threading
+
+import numpy as np
+
+from ocrengine import text_scale
+from preprocess import PIXEL_STAGES, preprocess_page
+
+
+class OcrPage(object):
+    """ Lazily computed, cached views of PIL image im
+
+    Used from the GUI thread and from OCR jobs, computing is serialized.
+    """
+    def __init__(self, im):
+        self.im = im
+        self._gray = None
+        self._ocrImages = {}
+        self._textScale = None
+        self._lock = threading.RLock()
+
+    @property
+    def size(self):
+        return self.im.size
+
+    def grayImage(self):
+        """ Grayscale PIL image of the page
+        """
+        with self._lock:
+            if self._gray is None:
+                self._gray = self.im.convert('L')
+            return self._gray
+
+    def gray(self):
+        """ Grayscale of the page as uint8 array (read only view)
+        """
+        return np.asarray(self.grayImage())
+
+    def ocrImage(self, stages, timing=None):
+        """ Grayscale PIL image after the pixel stages, text areas are
+        cropped from it; timing gets the seconds of the stages when they
+        run
+        """
+        stages = tuple(stage for stage in stages if stage in PIXEL_STAGES)
+        with self._lock:
+            if stages not in self._ocrImages:
+                self._ocrImages[stages] = preprocess_page(self.grayImage(),
+                                                          stages, timing)
+            return self._ocrImages[stages]
+
+    def textScale(self):
+        """ (scale, dpi) of text areas, see ocrengine.text_scale
+        """
+        with self._lock:
+            if self._textScale is None:
+                self._textScale = text_scale(self.im, self.gray())
+            return self._textScale
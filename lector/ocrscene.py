@@ -9,15 +9,24 @@
 """
 #pylint: disable-msg=C0103
 
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import Qt, QRectF, pyqtSignal
+from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QGraphicsScene
 
 from ocrarea import OcrArea
+from areaindex import AreaIndex
+from areastore import AreaStore
+from ocrwords import low_confidence_boxes
+from tilepyramid import TilePyramid
 
 
 class OcrScene(QGraphicsScene):
     selectedAreaIdx = None
+    ## words below this confidence are highlighted, None shows no words
+    lowConfidence = None
+    lowConfidenceColor = QColor(255, 0, 0, 70)
     changedSelectedAreaType = pyqtSignal(int)
+    backgroundReady = pyqtSignal()
 
     def __init__(self, _, lang, areaType):
         QGraphicsScene.__init__(self)
@@ -25,15 +34,34 @@ class OcrScene(QGraphicsScene):
         self.language = lang
         self.areaType = areaType
         self.first = True
-        self.areas = []
-        self.ocrImage = None
+        self.store = AreaStore()
+        self.index = AreaIndex()
+        self.pyramid = None
         self.isModified = None
-
-    def createArea(self, pos, size, type_, areaBorder, areaTextSize):
-        item = OcrArea(pos, size, type_, None, self, areaBorder,
-                len(self.areas) + 1, areaTextSize)
+        self._im = None
+        self.page = None
+
+    def _setImage(self, im):
+        # grayscale and OCR image of the old image are dropped with it;
+        # OcrPage brings the OCR engine modules, not needed before an image
+        from ocrpage import OcrPage
+        self._im = im
+        self.page = OcrPage(im) if im is not None else None
+
+    ## PIL image shown; OCR works on self.page made from it
+    im = property(fget=lambda self: self._im, fset=_setImage)
+
+    @property
+    def areas(self):
+        """ OcrArea items in reading order (rows of self.store)
+        """
+        return self.store.items
+
+    def createArea(self, pos, size, type_):
+        item = OcrArea(pos, size, type_)
+        self.store.append(item, self.areaRect(item), type_)
+        self.index.insert(item, self.areaRect(item))
         self.addItem(item)
-        self.areas.append(item)
         item.newEvent.isClicked.connect(self.changedSelection)
         self.setFocusItem(item)
         self.isModified = True
@@ -44,32 +72,55 @@ class OcrScene(QGraphicsScene):
         if item is None:
             return
 
-        idx = self.areas.index(item)
-
-        self.areas.remove(item)
+        self.store.remove(item)
         self.removeItem(item)
+        self.index.remove(item)
         self.selectedAreaIdx = None
+        # labels of the following areas show their new numbers
+        self.update()
 
-        for i, item in enumerate(self.areas[idx:]):
-            item.setIndex(i+idx-1)
+        self.__emitChangedSelection(0)
 
+    def clearAreas(self):
+        for item in self.areas:
+            self.removeItem(item)
+        self.store.clear()
+        self.index.clear()
+        self.selectedAreaIdx = None
         self.__emitChangedSelection(0)
 
     def updateAreas(self, areaBorder, areaTextSize):
-        def resizeBorderAndText(item):
-            # resize border
-            pen = item.pen()
-            pen.setWidthF(areaBorder)
-            item.setPen(pen)
-            item.setTextSize(areaTextSize)
-
-        map(resizeBorderAndText, self.areas)
-
+        # the style is shared; only the bounding rects have to be refreshed
+        for item in self.areas:
+            item.prepareGeometryChange()
+        OcrArea.setStyle(areaBorder, areaTextSize)
+        self.update()
+
+
+    @staticmethod
+    def areaRect(item):
+        """ (left, top, right, bottom) of area in scene coordinates
+        """
+        r = item.rect()
+        return (item.x(), item.y(), item.x() + r.width(),
+                item.y() + r.height())
+
+    def areaMoved(self, item):
+        """ Called by OcrArea when its position or size changes
+        """
+        rect = self.areaRect(item)
+        self.store.setBox(item, rect)
+        self.index.update(item, rect)
 
     def areaAt(self, pos):
         edge = 0
         onArea = 0
-        for i, item in enumerate(self.areas):
+        # only areas near the cursor, in the order of self.areas
+        candidates = sorted(self.index.candidates(pos.x(), pos.y(),
+                                                  OcrArea.resizeBorder),
+                            key=self.store.row)
+        for item in candidates:
+            i = self.store.row(item)
             r = item.rect()
 
             # this is not very clean... it checks that the mouse is over an
@@ -115,11 +166,15 @@ class OcrScene(QGraphicsScene):
         return edge
 
     def generateQtImage(self):
-        from utils import pilImage2Qt
+        # tiles are made on demand, lower resolutions in background thread
+        self.pyramid = TilePyramid(self.im, self.pyramidReady)
 
-        self.ocrImage = pilImage2Qt(self.im)
+    def pyramidReady(self, pyramid):
+        # called from the pyramid thread; signal is queued to GUI thread
+        if pyramid is self.pyramid:
+            self.backgroundReady.emit()
 
-    def drawBackground(self, painter, _):
+    def drawBackground(self, painter, rect):
         ## TODO: set the background to gray
         #painter.setBackgroundMode(QtCore.Qt.OpaqueMode)
 
@@ -127,13 +182,29 @@ class OcrScene(QGraphicsScene):
         #brushBg.setColor(QtCore.Qt.darkGreen)
         #painter.setBackground(brushBg)
 
-        if not (hasattr(self, 'ocrImage') and self.ocrImage):
+        if not self.pyramid:
             return
 
-        sceneRect = self.sceneRect()
-        painter.drawImage(sceneRect, self.ocrImage)
+        self.pyramid.paint(painter, rect.intersected(self.sceneRect()))
         #self.statusBar.showMessage(self.tr("Disegno bag"))
 
+    def drawForeground(self, painter, rect):
+        if self.lowConfidence is None or not self.store.words:
+            return
+        # only words of the exposed part, selected by NumPy
+        boxes = low_confidence_boxes(self.store.words.values(),
+                                     self.lowConfidence,
+                                     (rect.left(), rect.top(), rect.right(),
+                                      rect.bottom()))
+        if not len(boxes):
+            return
+        painter.save()
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.lowConfidenceColor)
+        painter.drawRects([QRectF(left, top, right - left, bottom - top)
+                           for left, top, right, bottom in boxes.tolist()])
+        painter.restore()
+
     def setSize(self):
         iw = float(self.im.size[0])
         ih = float(self.im.size[1])
@@ -144,7 +215,7 @@ class OcrScene(QGraphicsScene):
     # and to change it (only with the left button)
     def changedSelection(self):
         area = self.sender().area
-        self.selectedAreaIdx = self.areas.index(area)
+        self.selectedAreaIdx = self.store.row(area)
         self.__emitChangedSelection(area.kind)
 
     def __emitChangedSelection(self, _type):
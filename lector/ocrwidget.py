@@ -9,25 +9,34 @@
 """
 #pylint: disable-msg=C0103
 
-import os, time
+import os
 import math
-import glob
-from PIL import Image
+import threading
+import numpy as np
 
 from PyQt6.QtGui import QPainter, QTransform, QIcon
-from PyQt6.QtCore import Qt, QSizeF, QRectF
+from PyQt6.QtCore import Qt, QPointF, QSizeF, QRectF, QCoreApplication, \
+	pyqtSignal
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsItem, QProgressDialog
 
 from ocrarea import OcrArea
 from ocrscene import OcrScene
 from utils import settings
+# OCR, layout analysis, preprocessing and project files are imported when
+# first used, the empty window at startup needs none of them
 
 class QOcrWidget(QGraphicsView):
+	## shown page and the page straightened from it (background thread)
+	straightened = pyqtSignal(object, object)
+
 	def __init__(self, lang, areaType, statusBar):
 		QGraphicsView.__init__(self)
 
 		self.ocrscene = OcrScene(self, lang, areaType)
 		self.setScene(self.ocrscene)
+		self.ocrscene.backgroundReady.connect(self.refreshBackground)
+		self.straightened.connect(self.pageStraightened)
+		self.straightening = None
 
 		# was QGraphicsView.CacheBackground
 		self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
@@ -40,10 +49,9 @@ class QOcrWidget(QGraphicsView):
 
 		self.setMinimumSize(200, 200)
 
-		# CAUTION: gets overwritten with blank
+		# tesseract language of OCR, projects and area keys; set by the
+		# language combo box of the window
 		self.language = lang
-		# added 
-		self.lang = lang
 		self.statusBar = statusBar
 		self.areaType = areaType
 
@@ -60,7 +68,11 @@ class QOcrWidget(QGraphicsView):
 		self.scene().isModified = False
 		self.bResizing = False
 		self.filename = None
-		Image.init()
+		# page from the scanner (PIL image) until it is saved with a project
+		self.scannedImage = None
+		self.job = None
+		self.jobAreas = []
+		self.incremental = False
 
 	def mouseMoveEvent(self, event):
 		sp = self.mapToScene(event.pos())
@@ -162,8 +174,7 @@ class QOcrWidget(QGraphicsView):
 		elif iArea == -1 and self.filename:
 			size = QSizeF(0, 0)
 			newArea = self.scene().createArea(sp,
-				size, self.areaType, self.areaBorder,
-				self.areaTextSize)
+				size, self.areaType)
 
 			self.bResizing = True
 			self.resizingEdge = 10
@@ -208,14 +219,52 @@ class QOcrWidget(QGraphicsView):
 		self.scale(scaleFactor, scaleFactor)
 
 	def changeImage(self):
-		#delete old OcrArea
-		for item in self.scene().items():
-			self.scene().removeItem(item)
-		self.scene().areas = []
+		from PIL import Image
 
-		#open image
-		self.scene().im = Image.open(self.filename)
+		#delete old OcrArea
+		self.scene().clearAreas()
+		self.scannedImage = None
+		im = Image.open(self.filename)
+		# decoded here, the pyramid and deskew threads share the image
+		im.load()
+		self.showPage(im)
+
+	def showPage(self, im):
+		""" Show PIL image at once; with deskew selected it is replaced by
+		the straightened page as soon as a background thread has made it
+		"""
+		from preprocess import selected_stages
+
+		self.scene().im = im
 		self.prepareDimensions()
+		self.straightening = None
+		stages = selected_stages()
+		if 'deskew' in stages:
+			# rotation keeps the size, areas drawn meanwhile stay valid
+			self.straightening = threading.Thread(target=self._straighten,
+				args=(im, stages))
+			self.straightening.daemon = True
+			self.straightening.start()
+
+	def _straighten(self, im, stages):
+		from preprocess import straighten_page, format_timing
+
+		timing = {}
+		page = straighten_page(im, stages, timing)
+		print("Preprocessing: " + format_timing(timing))
+		try:
+			self.straightened.emit(im, page)
+		except RuntimeError:
+			# the window was closed meanwhile
+			pass
+
+	def pageStraightened(self, source, im):
+		# another page may be shown meanwhile
+		if source is not self.scene().im or im is source:
+			return
+		self.scene().im = im
+		self.scene().generateQtImage()
+		self.resetCachedContent()
 
 
 	def prepareDimensions(self):
@@ -234,6 +283,7 @@ class QOcrWidget(QGraphicsView):
 		OcrArea.resizeBorder = 5 / ratio
 		self.areaBorder = 2 / ratio
 		self.areaTextSize = 10 / ratio
+		scene.updateAreas(self.areaBorder, self.areaTextSize)
 
 		#show image
 		scene.generateQtImage()
@@ -241,6 +291,25 @@ class QOcrWidget(QGraphicsView):
 		scene.isModified = False
 
 
+	def refreshBackground(self):
+		# coarser levels of the page are ready
+		self.resetCachedContent()
+		self.viewport().update()
+
+	def detectAreas(self):
+		""" Replace areas by the ones proposed by page layout analysis
+		"""
+		from layout import analyse_page
+
+		scene = self.scene()
+		scene.clearAreas()
+		for (left, top, right, bottom), kind in analyse_page(scene.im,
+				scene.page.gray()):
+			scene.createArea(QPointF(left, top),
+				QSizeF(right - left, bottom - top), kind)
+		self.statusBar.showMessage(self.tr("%d area(s) detected") %
+			len(scene.areas))
+
 	def rotate(self, angle):
 		scene = self.scene()
 		scene.im = scene.im.rotate(angle)
@@ -277,20 +346,34 @@ class QOcrWidget(QGraphicsView):
 		self.zoom(.8)
 
 	def doOcr(self):
-		import codecs
-		aItems = self.scene().areas
-		numItems = len(aItems)
+		if self.job and self.job.isRunning():
+			return
+		if self.straightening is not None:
+			# areas are recognized on the straightened page
+			self.straightening.join()
+			QCoreApplication.sendPostedEvents(self)
+			self.straightening = None
+		store = self.scene().store
+		numItems = len(store)
 		print(f'''numItems {numItems}''')
 
-		if settings.get('editor:clear') :
+		# after the first run only changed areas are recognized and only
+		# their text is replaced in the editor
+		ids = store.ids().tolist()
+		self.incremental = bool(store.results)
+		if self.incremental:
+			for areaId in set(store.results) - set(ids):
+				del store.results[areaId]
+				store.words.pop(areaId, None)
+				self.textEditor.removeAreaText(areaId)
+		elif settings.get('editor:clear') :
 			self.textEditor.clear()
 
-		# clean temp to avoid false imports
-		for oldOutPut in glob.glob('/tmp/out.[0-9]*.txt'):
-			os.remove(oldOutPut)
+		self.jobAreas = list(zip(ids, store.pixelBoxes(),
+								 store.kinds().tolist()))
 
 		progress = QProgressDialog(self.tr("Processing images..."),
-										 self.tr("Abort"), 0, numItems)
+										 self.tr("Abort"), 0, numItems, self)
 		progress.setWindowTitle(self.tr("Processing images..."))
 		# was Qt.WindowModal
 		progress.setWindowModality(Qt.WindowModality.WindowModal)
@@ -302,78 +385,118 @@ class QOcrWidget(QGraphicsView):
 		progress.setAutoReset(True)
 		progress.forceShow()
 
-		tess_exec = settings.get('tesseract-ocr:executable')
-		if not tess_exec:
-			tess_exec = 'tesseract'
-
-		for i, item in enumerate(aItems):
-			if progress.wasCanceled():
-				break
-
-			progress.setValue(i)
-			rect = item.rect()
-			pos = item.scenePos()
-
-			box = (int(pos.x()), int(pos.y()), int(rect.width() + pos.x()), \
-					int(rect.height() + pos.y()))
-			# TODO: make random filename if we do not debug lector ;-)
-			# TODO: use png if tesseract version is > 3.00
-			# was filename = "/tmp/out.%d.png" % i
-			tempPath = "tmp"
-			filename = tempPath + "/out.%d.png" % i
-
-			region = self.scene().im.crop(box)
-
-			if item.kind == 1:
-				# Improve quality of text for tesseract
-				# TODO: put it as option for OCR because of longer duration
-				nx, ny = rect.width(), rect.height()
-				region = region.resize((int(nx*3), int(ny*3)), \
-							Image.BICUBIC).convert('L')
-				# added try, makedirs() to handle `No such file or directory: '/tmp/out.0.png'`
-				try:
-					if not os.path.exists(tempPath):
-						os.makedirs(tempPath)
-					region.save(filename, dpi=(600, 600))
-				except Exception as e:
-					print(f'''Failed to save {filename}.''')
-				# TODO: use html/hocr if tesseract version is > 3.01
-				""" 
-				command = tess_exec + " %s /tmp/out.%d -l %s" % (filename, i,
-																			  self.language)
-				"""
-				command = f'''"{tess_exec}" {filename} {tempPath}/out.{i} -l {self.lang}'''
-				os.popen(command)
-				
-				# added to allow writing of text file to complete first before opening it
-				time.sleep(2)
-
-				# was "/tmp/out.%d.txt"
-				ocrTxtFilePath = tempPath + "/out.%d.txt" % (i)
-				if os.path.exists(ocrTxtFilePath):
-					""" 
-					s = codecs.open(tempPath + "/out.%d.txt" % \
-											(i, ) , 'r', 'utf-8').read()
-					"""
-					s = codecs.open(ocrTxtFilePath , 'r', 'utf-8').read()
-					self.textEditor.append(s)
-					# TODO: delete image & OCR result if we do not debug lector
-				else:
-					## TODO: tesseract failed.
-					## 1. process/print error message
-					## 2. mark area as problematic
-					print("Tesseract was unabled to process area!")
-					# this can happend if left side of text is blury
-			else:
-				region = region.resize((int(region.size[0]/4),
-										int(region.size[1]/4)))
-				region.save(filename)
-
-				s = "<img src='%s'>" % filename
-				self.textEditor.append(s)
-
-		progress.setValue(numItems)
+		# the GUI thread only shows results, OCR runs in the job
+		from ocrjob import OcrJob
+		self.job = OcrJob(self.scene().page, list(self.jobAreas),
+						  self.language, dict(store.results), self)
+		self.job.areaDone.connect(self.ocrAreaDone)
+		self.job.kindDetected.connect(self.ocrKindDetected)
+		self.job.progress.connect(progress.setValue)
+		self.job.summary.connect(self.ocrFinished)
+		self.job.finished.connect(progress.close)
+		progress.canceled.connect(self.job.cancel)
+		self.job.start()
+
+	def ocrAreaDone(self, result, key):
+		if result.returncode:
+			return
+		store = self.scene().store
+		areaId, _, kind = self.jobAreas[result.index]
+		previous = store.results.get(areaId)
+		store.results[areaId] = (key, result.text)
+		if previous and previous[0] == key:
+			return
+		if result.words is not None:
+			store.words[areaId] = result.words
+		else:
+			store.words.pop(areaId, None)
+		if self.scene().lowConfidence is not None:
+			self.scene().update()
+
+		html = kind != 1
+		if not self.incremental:
+			# empty text can happend if left side of text is blury
+			if result.text:
+				self.textEditor.appendArea(areaId, result.text, html)
+		elif result.text:
+			self.textEditor.setAreaText(areaId, result.text,
+				[area[0] for area in self.jobAreas[:result.index]], html)
+		else:
+			self.textEditor.removeAreaText(areaId)
+
+	def ocrKindDetected(self, index, kind):
+		""" Show the kind found by the job, if the area still exists
+		"""
+		store = self.scene().store
+		areaId, box, _ = self.jobAreas[index]
+		self.jobAreas[index] = (areaId, box, kind)
+		rows = np.flatnonzero(store.ids() == areaId)
+		if len(rows):
+			store.items[rows[0]].kind = kind
+
+	def showLowConfidence(self, show):
+		""" Highlight words recognized with low confidence
+		"""
+		scene = self.scene()
+		scene.lowConfidence = settings.get('ocr:lowConfidence') if show \
+			else None
+		scene.update()
+
+	def ocrFinished(self, messages):
+		if messages:
+			self.statusBar.showMessage('; '.join(messages))
+
+	def cancelOcr(self):
+		""" Abort running OCR and wait for its thread
+		"""
+		if self.job and self.job.isRunning():
+			self.job.cancel()
+			self.job.wait()
+
+
+	def openProject(self, filename):
+		""" Show image, areas and text of project filename
+		"""
+		from project import load_project
+
+		self.cancelOcr()
+		image, lang, areas = load_project(filename)
+		self.filename = image
+		self.changeImage()
+		self.language = lang
 
+		scene = self.scene()
+		self.textEditor.clear()
+		for (left, top, right, bottom), kind, key, text, words in areas:
+			item = scene.createArea(QPointF(left, top),
+				QSizeF(right - left, bottom - top), kind)
+			if key is None:
+				continue
+			areaId = int(scene.store.ids()[scene.store.row(item)])
+			scene.store.results[areaId] = (key, text)
+			if words is not None:
+				scene.store.words[areaId] = words
+			if text:
+				self.textEditor.appendArea(areaId, text, kind != 1)
+
+	def saveProject(self, filename):
+		""" Save image, areas and their last OCR results to filename; a
+		scanned page is saved as PNG with the name of the project
+		"""
+		store = self.scene().store
+		areas = []
+		for areaId, box, kind in zip(store.ids().tolist(),
+				store.pixelBoxes(), store.kinds().tolist()):
+			key, text = store.results.get(areaId, (None, None))
+			areas.append((box, kind, key, text, store.words.get(areaId)))
+		if self.scannedImage is not None:
+			# a scanned page has no file yet, it is kept next to the project
+			image = os.path.splitext(filename)[0] + '.png'
+			self.scannedImage.save(image)
+			self.filename = image
+			self.scannedImage = None
+		from project import save_project
+		save_project(filename, self.filename, self.language, areas)
 
 	def keyReleaseEvent(self, event):
 		if event.key() == Qt.Key_Delete:
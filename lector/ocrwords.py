@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: ocrwords.py
+
+    Words recognized in an area, parsed from tesseract's TSV output: one
+    row per word with its box in page coordinates, confidence and line.
+    The plain text of the area is rebuilt from them, so tesseract runs only
+    once per area.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import numpy as np
+
+## TSV level of word rows
+WORD_LEVEL = 5
+TSV_HEADER = ('level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t'
+              'left\ttop\twidth\theight\tconf\ttext')
+
+
+class Words(object):
+    """ Words of one area
+
+    boxes are (left, top, right, bottom) in page coordinates, conf the
+    tesseract confidence (0 - 100) and lines (block, paragraph, line)
+    numbers of every word.
+
+    >>> tsv = ('level\\tpage_num\\tblock_num\\tpar_num\\tline_num\\t'
+    ...        'word_num\\tleft\\ttop\\twidth\\theight\\tconf\\ttext\\n'
+    ...        '4\\t1\\t1\\t1\\t1\\t0\\t0\\t0\\t40\\t10\\t-1\\t\\n'
+    ...        '5\\t1\\t1\\t1\\t1\\t1\\t0\\t0\\t20\\t10\\t96.5\\tHello\\n'
+    ...        '5\\t1\\t1\\t1\\t1\\t2\\t24\\t0\\t16\\t10\\t41\\twrld\\n'
+    ...        '5\\t1\\t1\\t2\\t1\\t1\\t0\\t20\\t8\\t10\\t90\\tBye\\n')
+    >>> words = parse_tsv(tsv, scale=2., offset=(100, 50))
+    >>> len(words), words.boxes[1].tolist()
+    (3, [112, 50, 120, 55])
+    >>> words.text()
+    'Hello wrld\\n\\nBye\\n'
+    >>> words.lowConfidence(60).tolist()
+    [1]
+    >>> parse_tsv(words.tsv((100, 50)), offset=(100, 50)).boxes.tolist()[1]
+    [112, 50, 120, 55]
+    """
+    def __init__(self, boxes, conf, lines, words):
+        self.boxes = boxes
+        self.conf = conf
+        self.lines = lines
+        self.words = words
+
+    def __len__(self):
+        return len(self.words)
+
+    def text(self):
+        """ Plain text like tesseract's txt output: a line per line and an
+        empty line between paragraphs
+        """
+        if not len(self):
+            return ''
+        text = []
+        for i, word in enumerate(self.words):
+            if i:
+                block, par, line = self.lines[i - 1]
+                if (block, par) != tuple(self.lines[i, :2]):
+                    text.append('\n\n')
+                elif line != self.lines[i, 2]:
+                    text.append('\n')
+                else:
+                    text.append(' ')
+            text.append(word)
+        text.append('\n')
+        return ''.join(text)
+
+    def lowConfidence(self, threshold):
+        """ Indexes of words with confidence below threshold
+        """
+        return np.flatnonzero(self.conf < threshold)
+
+    def meanConfidence(self):
+        if not len(self):
+            return 0.
+        return float(self.conf.mean())
+
+    def tsv(self, offset=(0, 0)):
+        """ Word rows of tesseract's TSV, boxes relative to offset
+        """
+        rows = [TSV_HEADER]
+        boxes = self.boxes - np.tile(np.asarray(offset, np.int32), 2)
+        number = 0
+        for i, word in enumerate(self.words):
+            block, par, line = self.lines[i]
+            if i and tuple(self.lines[i - 1]) == (block, par, line):
+                number += 1
+            else:
+                number = 1
+            left, top, right, bottom = boxes[i]
+            rows.append('\t'.join(str(v) for v in (
+                WORD_LEVEL, 1, block, par, line, number, left, top,
+                right - left, bottom - top, round(float(self.conf[i]), 2),
+                word)))
+        return '\n'.join(rows) + '\n'
+
+    def asDict(self):
+        """ JSON serializable form, see fromDict
+        """
+        return {'boxes': self.boxes.tolist(),
+                'conf': [round(c, 2) for c in self.conf.tolist()],
+                'lines': self.lines.tolist(), 'words': list(self.words)}
+
+    @staticmethod
+    def fromDict(data):
+        return Words(np.array(data['boxes'], np.int32).reshape(-1, 4),
+                     np.array(data['conf'], np.float32),
+                     np.array(data['lines'], np.int32).reshape(-1, 3),
+                     list(data['words']))
+
+
+def parse_tsv(tsv, scale=1., offset=(0, 0)):
+    """ Words from TSV of an area recognized at scale, whose top left
+    corner is at offset of the page
+    """
+    boxes, conf, lines, words = [], [], [], []
+    for row in tsv.split('\n')[1:]:
+        fields = row.split('\t')
+        if len(fields) < 12 or fields[0] != str(WORD_LEVEL):
+            continue
+        text = fields[11].strip()
+        if not text:
+            continue
+        left, top, width, height = [int(v) for v in fields[6:10]]
+        boxes.append((left, top, left + width, top + height))
+        conf.append(float(fields[10]))
+        lines.append([int(v) for v in fields[2:5]])
+        words.append(text)
+
+    boxes = np.array(boxes, np.float64).reshape(-1, 4) / scale
+    boxes += np.tile(offset, 2)
+    return Words(np.round(boxes).astype(np.int32),
+                 np.array(conf, np.float32),
+                 np.array(lines, np.int32).reshape(-1, 3), words)
+
+
+def join_words(parts):
+    """ Words of an area recognized in horizontal strips
+
+    parts are [(words, ownTop, ownBottom)] from top to bottom; strips may
+    overlap, a word is taken from the strip owning the center of its box.
+    Blocks of every strip stay apart.
+    """
+    kept = []
+    blocks = 0
+    for words, ownTop, ownBottom in parts:
+        centers = (words.boxes[:, 1] + words.boxes[:, 3]) / 2.
+        idx = np.flatnonzero((centers >= ownTop) & (centers < ownBottom))
+        lines = words.lines[idx].copy()
+        lines[:, 0] += blocks
+        if len(idx):
+            blocks = int(lines[:, 0].max())
+        kept.append(Words(words.boxes[idx], words.conf[idx], lines,
+                          [words.words[i] for i in idx]))
+    return Words(np.concatenate([words.boxes for words in kept]),
+                 np.concatenate([words.conf for words in kept]),
+                 np.concatenate([words.lines for words in kept]),
+                 [word for words in kept for word in words.words])
+
+
+def low_confidence_boxes(wordsList, threshold, rect=None):
+    """ (n, 4) array of the boxes of all words below threshold, only the
+    ones intersecting rect (left, top, right, bottom) if given
+    """
+    boxes = [words.boxes[words.lowConfidence(threshold)]
+             for words in wordsList if len(words)]
+    if not boxes:
+        return np.zeros((0, 4), np.int32)
+    boxes = np.concatenate(boxes)
+    if rect is not None:
+        left, top, right, bottom = rect
+        boxes = boxes[(boxes[:, 0] < right) & (boxes[:, 2] > left) &
+                      (boxes[:, 1] < bottom) & (boxes[:, 3] > top)]
+    return boxes
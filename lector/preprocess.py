@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: preprocess.py
+
+    Page preprocessing before OCR on NumPy arrays: projection based deskew,
+    median denoise, Otsu or Sauvola thresholding and morphological removal
+    of specks. The stages to run are chosen by the 'ocr:preprocess' setting
+    (comma separated names from STAGES); they always run in STAGES order.
+
+    No stage runs unless selected. Deskew changes the geometry of the page,
+    so it is applied to the page shown in the scene (in a background thread,
+    areas are drawn on the straightened page); the other stages only change
+    pixels and run once per page before the text areas are cropped.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import time
+
+import numpy as np
+from PIL import Image
+
+from layout import otsu_threshold
+from utils import settings
+
+STAGES = ('deskew', 'median', 'otsu', 'sauvola', 'despeckle')
+
+## deskew searches +-MAX_SKEW degrees on a page reduced to DESKEW_SIZE
+MAX_SKEW = 5.
+DESKEW_SIZE = 1200
+## paper colour of the corners uncovered by deskew, by image mode
+WHITE = {'1': 255, 'L': 255, 'LA': (255, 255), 'RGB': (255, 255, 255),
+         'RGBA': (255, 255, 255, 255), 'I;16': 65535, 'CMYK': (0, 0, 0, 0)}
+## rows processed at once by the window filters (bounds memory use)
+STRIP = 512
+
+
+def selected_stages(value=None):
+    """ Stages from setting value, in pipeline order
+
+    Despeckle needs a binarized page, it is dropped without otsu or
+    sauvola.
+
+    >>> selected_stages('despeckle, otsu, deskew,foo')
+    ['deskew', 'otsu', 'despeckle']
+    >>> selected_stages('despeckle,deskew')
+    ['deskew']
+    """
+    if value is None:
+        value = settings.get('ocr:preprocess')
+    names = [name.strip() for name in value.split(',')]
+    if 'otsu' not in names and 'sauvola' not in names:
+        names = [name for name in names if name != 'despeckle']
+    return [stage for stage in STAGES if stage in names]
+
+
+def skew_angle(gray):
+    """ Skew of text lines in degrees (counterclockwise rotation fixes it)
+
+    Ink pixels are projected onto rows of a sheared page; the shear that
+    gives the sharpest row profile aligns the text lines.
+    """
+    factor = max(1, max(gray.shape) // DESKEW_SIZE)
+    small = gray[::factor, ::factor]
+    ys, xs = np.nonzero(small <= otsu_threshold(small))
+    if ys.size < 100:
+        return 0.
+    xs = xs - small.shape[1] / 2.
+    ys = ys.astype(np.float64)
+
+    def score(angle):
+        rows = np.round(ys - xs * np.tan(np.radians(angle))).astype(np.intp)
+        profile = np.bincount(rows - rows.min())
+        return np.sum(np.diff(profile).astype(np.float64) ** 2)
+
+    best = 0.
+    for step, span in ((.5, MAX_SKEW), (.05, .5)):
+        angles = np.arange(best - span, best + span + step / 2, step)
+        best = float(angles[np.argmax([score(a) for a in angles])])
+    # pictures have no lines; do not rotate them by a random angle
+    if score(best) < 1.05 * score(0.):
+        return 0.
+    return best
+
+
+def deskew(im):
+    """ PIL image rotated so that the text lines are horizontal
+    """
+    angle = skew_angle(np.asarray(im.convert('L')))
+    if abs(angle) < .05:
+        return im
+    if im.mode == 'P':
+        # palette indexes can not be interpolated nor filled with white
+        im = im.convert('RGBA' if 'transparency' in im.info else 'RGB')
+    return im.rotate(angle, Image.BICUBIC, fillcolor=WHITE.get(im.mode))
+
+
+def _strips(height, pad):
+    """ (start, end, padded start, padded end) of row strips
+    """
+    for start in range(0, height, STRIP):
+        end = min(start + STRIP, height)
+        yield start, end, max(0, start - pad), min(height, end + pad)
+
+
+def median(gray):
+    """ 3x3 median filter of uint8 array (edges replicated)
+    """
+    padded = np.pad(gray, 1, mode='edge')
+    height, width = gray.shape
+    out = np.empty_like(gray)
+    for start, end, _, _ in _strips(height, 0):
+        window = np.stack([padded[start + dy:end + dy, dx:dx + width]
+                           for dy in range(3) for dx in range(3)])
+        out[start:end] = np.partition(window, 4, axis=0)[4]
+    return out
+
+
+def otsu(gray):
+    """ Global threshold, ink 0 and paper 255
+    """
+    return np.where(gray > otsu_threshold(gray), 255, 0).astype(np.uint8)
+
+
+def sauvola(gray, window=25, k=.2, r=128.):
+    """ Local threshold T = m * (1 + k * (s / r - 1)) over window x window
+
+    Mean m and deviation s come from integral images, computed strip by
+    strip.
+    """
+    half = window // 2
+    height, width = gray.shape
+    out = np.empty_like(gray)
+    for start, end, pstart, pend in _strips(height, half):
+        block = np.pad(gray[pstart:pend].astype(np.float64),
+                       ((0, 0), (half, half)), mode='edge')
+        integral = np.zeros((block.shape[0] + 1, block.shape[1] + 1))
+        integral[1:, 1:] = block.cumsum(0).cumsum(1)
+        squares = np.zeros_like(integral)
+        squares[1:, 1:] = (block ** 2).cumsum(0).cumsum(1)
+
+        rows = np.arange(start, end) - pstart
+        top = np.maximum(rows - half, 0)[:, None]
+        bottom = np.minimum(rows + half + 1, pend - pstart)[:, None]
+        left = np.arange(width)[None, :]
+        right = left + window
+
+        def window_sum(table):
+            return table[bottom, right] - table[top, right] - \
+                table[bottom, left] + table[top, left]
+
+        count = (bottom - top) * window
+        mean = window_sum(integral) / count
+        std = np.sqrt(np.maximum(window_sum(squares) / count - mean ** 2, 0))
+        threshold = mean * (1 + k * (std / r - 1))
+        out[start:end] = np.where(gray[start:end] > threshold, 255, 0)
+    return out
+
+
+def despeckle(binary):
+    """ Morphological cleanup of 0/255 array
+
+    Ink pixels without any ink neighbour are removed, paper pixels
+    surrounded by ink are filled.
+    """
+    ink = np.pad(binary == 0, 1).astype(np.uint8)
+    height, width = binary.shape
+    neighbours = sum(ink[dy:dy + height, dx:dx + width]
+                     for dy in range(3) for dx in range(3)
+                     if dy != 1 or dx != 1)
+    out = binary.copy()
+    out[(binary == 0) & (neighbours == 0)] = 255
+    out[(binary != 0) & (neighbours == 8)] = 0
+    return out
+
+
+PIXEL_STAGES = {'median': median, 'otsu': otsu, 'sauvola': sauvola,
+                'despeckle': despeckle}
+
+
+def straighten_page(im, stages, timing=None):
+    """ Apply geometry stages to PIL image
+    """
+    if 'deskew' in stages:
+        start = time.time()
+        im = deskew(im)
+        if timing is not None:
+            timing['deskew'] = time.time() - start
+    return im
+
+
+def preprocess_page(im, stages, timing=None):
+    """ Apply pixel stages to PIL image, returns grayscale PIL image
+
+    Returns im itself when no pixel stage is selected. Seconds spent in each
+    stage are stored to timing (dict) if given.
+    """
+    stages = [stage for stage in stages if stage in PIXEL_STAGES]
+    if not stages:
+        return im
+    gray = np.asarray(im.convert('L'))
+    for stage in stages:
+        start = time.time()
+        gray = PIXEL_STAGES[stage](gray)
+        if timing is not None:
+            timing[stage] = time.time() - start
+    return Image.fromarray(gray)
+
+
+def format_timing(timing):
+    """ 'stage 0.12 s, ...' in pipeline order
+
+    >>> format_timing({'otsu': .5, 'deskew': .25})
+    'deskew 0.25 s, otsu 0.50 s'
+    """
+    return ', '.join('%s %.2f s' % (stage, timing[stage])
+                     for stage in STAGES if stage in timing)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: project.py
+
+    Lector projects: the page image, its areas and their OCR results, saved
+    as JSON. The areas use the same format as batch layout files, so a
+    project can be passed to 'lector --batch --layout' too:
+
+    {"version": 1, "image": "page.tif", "language": "eng",
+     "areas": [{"box": [left, top, right, bottom], "kind": 1,
+                "key": "...", "text": "...", "words": {...}}]}
+
+    key is the content key of the area (area_key); a result is reused as
+    long as the key of the area stays the same. words are the word boxes
+    and confidences of text areas (ocrwords.Words.asDict).
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import os
+import json
+import hashlib
+
+import numpy as np
+
+from ocrwords import Words
+
+VERSION = 1
+EXTENSION = '.lector'
+
+
+def area_key(region, box, kind, lang):
+    """ Content key of area: changes when it is moved, resized, re-typed or
+    when the pixels below it change
+
+    region is the uint8 array of the area in the grayscale page.
+    """
+    region = np.ascontiguousarray(region)
+    digest = hashlib.sha1()
+    digest.update(json.dumps([list(box), kind, lang, 'L',
+                              list(region.shape)]).encode('utf-8'))
+    digest.update(region.tobytes())
+    return digest.hexdigest()
+
+
+def save_project(filename, image, lang, areas):
+    """ Write project; areas are [(box, kind, key, text, words)], key, text
+    and words may be None if the area has not been recognized
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    try:
+        image = os.path.relpath(os.path.abspath(image), directory)
+    except ValueError:
+        # other drive on MS Windows
+        image = os.path.abspath(image)
+
+    project = {'version': VERSION, 'image': image, 'language': lang,
+               'areas': []}
+    for box, kind, key, text, words in areas:
+        area = {'box': [int(v) for v in box], 'kind': int(kind)}
+        if key is not None:
+            area['key'] = key
+            area['text'] = text
+        if words is not None:
+            area['words'] = words.asDict()
+        project['areas'].append(area)
+
+    with open(filename, 'w', encoding='utf-8') as project_file:
+        json.dump(project, project_file, indent=1, ensure_ascii=False)
+
+
+def load_project(filename):
+    """ Read project, returns (image path, language, areas) with areas as
+    [(box, kind, key, text, words)]
+    """
+    with open(filename, 'r', encoding='utf-8') as project_file:
+        project = json.load(project_file)
+    if project.get('version', VERSION) > VERSION:
+        raise ValueError("Project '%s' needs a newer Lector" % filename)
+
+    image = os.path.join(os.path.dirname(os.path.abspath(filename)),
+                         project['image'])
+    areas = [(tuple(area['box']), area.get('kind', 1), area.get('key'),
+              area.get('text'),
+              Words.fromDict(area['words']) if 'words' in area else None)
+             for area in project['areas']]
+    return image, project.get('language', 'eng'), areas
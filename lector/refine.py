@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: refine.py
+
+    Second recognition pass over the weak lines of an area. Lines with a
+    word below the confidence threshold are cropped and read again as
+    single lines with other parameters; the variant with the best mean
+    confidence replaces the words of the line. Lines that were read well
+    the first time cost nothing.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import time
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image
+
+from ocrengine import recognize_area
+from ocrwords import Words, parse_tsv
+from preprocess import PIXEL_STAGES
+
+## tesseract page segmentation mode: treat the image as a single text line
+PSM_SINGLE_LINE = 7
+## alternatives tried for every weak line:
+## (page segmentation mode, extra scale, binarization stage or None)
+VARIANTS = ((PSM_SINGLE_LINE, 1., None),
+            (PSM_SINGLE_LINE, 1.5, None),
+            (PSM_SINGLE_LINE, 1., 'sauvola'))
+## margin around the line box, in page pixels
+PADDING = 4
+
+## lines: weak lines found, improved: lines replaced, runs: extra tesseract
+## runs, seconds: time spent in this pass
+RefineStats = namedtuple('RefineStats', 'lines improved runs seconds')
+
+
+def weak_lines(words, threshold):
+    """ [(word indexes, (left, top, right, bottom))] of the lines with a
+    word below threshold, in reading order
+
+    >>> words = Words(np.array([[0, 0, 9, 9], [10, 0, 19, 9], [0, 20, 9, 29]]),
+    ...               np.array([90., 30., 95.]),
+    ...               np.array([[1, 1, 1], [1, 1, 1], [1, 1, 2]]),
+    ...               ['good', 'bad', 'fine'])
+    >>> [(idx.tolist(), box) for idx, box in weak_lines(words, 70)]
+    [([0, 1], (0, 0, 19, 9))]
+    """
+    if not len(words):
+        return []
+    lines, inverse = np.unique(words.lines, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    weak = []
+    for line in range(len(lines)):
+        idx = np.flatnonzero(inverse == line)
+        if words.conf[idx].min() < threshold:
+            boxes = words.boxes[idx]
+            weak.append((idx, (int(boxes[:, 0].min()), int(boxes[:, 1].min()),
+                               int(boxes[:, 2].max()),
+                               int(boxes[:, 3].max()))))
+    return weak
+
+
+def _read_line(engine, region, lang, scale, dpi, psm, binarization, offset):
+    if binarization:
+        region = Image.fromarray(
+            PIXEL_STAGES[binarization](np.asarray(region.convert('L'))))
+    result = recognize_area(engine, 0, region, lang, 'tsv', scale, dpi, psm)
+    if result.returncode:
+        return None
+    return parse_tsv(result.text, scale, offset)
+
+
+def refine_words(engine, page, words, lang, threshold, scale=1., dpi=300,
+                 variants=VARIANTS):
+    """ Words with the weak lines read again from PIL page; returns
+    (words, RefineStats). Runs in worker threads like recognize_area.
+    """
+    start = time.time()
+    weak = weak_lines(words, threshold)
+    runs = 0
+    replaced = {}
+    width, height = page.size
+    for idx, (left, top, right, bottom) in weak:
+        box = (max(left - PADDING, 0), max(top - PADDING, 0),
+               min(right + PADDING, width), min(bottom + PADDING, height))
+        region = page.crop(box)
+        best = None
+        bestConf = float(words.conf[idx].mean())
+        for psm, factor, binarization in variants:
+            if engine.cancelled:
+                break
+            runs += 1
+            lineWords = _read_line(engine, region, lang, scale * factor,
+                                   int(dpi * factor), psm, binarization,
+                                   box[:2])
+            if lineWords and lineWords.meanConfidence() > bestConf:
+                best, bestConf = lineWords, lineWords.meanConfidence()
+        if best is not None:
+            # the new words belong to the line they replace
+            best.lines[:] = words.lines[idx[0]]
+            replaced[idx[0]] = (idx, best)
+
+    if replaced:
+        words = _replace_lines(words, replaced)
+    return words, RefineStats(len(weak), len(replaced), runs,
+                              time.time() - start)
+
+
+def _replace_lines(words, replaced):
+    """ Words with the rows of every line replaced, replaced maps the first
+    word index of a line to (word indexes, new Words)
+    """
+    dropped = np.zeros(len(words), bool)
+    for idx, _ in replaced.values():
+        dropped[idx] = True
+    parts = []
+    for i in range(len(words)):
+        if i in replaced:
+            parts.append(replaced[i][1])
+        elif not dropped[i]:
+            parts.append(Words(words.boxes[i:i + 1], words.conf[i:i + 1],
+                               words.lines[i:i + 1], words.words[i:i + 1]))
+    return Words(np.concatenate([part.boxes for part in parts]),
+                 np.concatenate([part.conf for part in parts]),
+                 np.concatenate([part.lines for part in parts]),
+                 [word for part in parts for word in part.words])
+
+
+def format_stats(stats, firstPass):
+    """ Summary of RefineStats of all areas; firstPass are the seconds of
+    the first recognition pass
+    """
+    lines = sum(s.lines for s in stats)
+    improved = sum(s.improved for s in stats)
+    runs = sum(s.runs for s in stats)
+    seconds = sum(s.seconds for s in stats)
+    extra = 100 * seconds / firstPass if firstPass else 0
+    return "%d weak line(s) re-read, %d improved: %d extra run(s), " \
+        "%.1f s (+%d%%)" % (lines, improved, runs, seconds, extra)
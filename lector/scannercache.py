@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: scannercache.py
+
+    SANE device discovery off the GUI thread, with the last known device
+    list kept on disk. sane.get_devices() may wait many seconds for
+    network scanners; the stored list lets Lector enable scanning with the
+    configured device at once, discovery runs again on demand or when the
+    list is older than DEVICES_TTL.
+
+    The options Lector uses (scan area, resolutions, colour modes) of every
+    device are kept the same way: opening a device may warm up its lamp,
+    so it is opened again only after OPTIONS_TTL or on request.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import os
+import sys
+import json
+import time
+import threading
+
+from PyQt6.QtCore import QObject, QStandardPaths, pyqtSignal
+
+## seconds after which the stored device list is discovered again
+DEVICES_TTL = 24 * 3600
+## seconds after which the options of a device are read again
+OPTIONS_TTL = 7 * 24 * 3600
+
+_lock = threading.Lock()
+
+
+def default_path():
+    cache_dir = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(cache_dir, 'lector', 'scanners.json')
+
+
+def _load(path):
+    try:
+        with open(path or default_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store(path, update):
+    """ Apply update to the stored data (a dict) and write it back
+    """
+    path = path or default_path()
+    with _lock:
+        data = _load(path)
+        update(data)
+        directory = os.path.dirname(path)
+        try:
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            temp = '%s.%d' % (path, os.getpid())
+            with open(temp, 'w') as f:
+                json.dump(data, f, indent=1)
+            os.replace(temp, path)
+        except OSError as ex:
+            print("Could not store scanner cache: %s" % ex, file=sys.stderr)
+
+
+def cached_devices(path=None):
+    """ (devices, age in seconds) of the last discovery, None if there was
+    none; devices are sane.get_devices() tuples
+    (name, vendor, model, type)
+    """
+    entry = _load(path).get('devices')
+    if not entry:
+        return None
+    return ([tuple(device) for device in entry['list']],
+            time.time() - entry['time'])
+
+
+def discover(path=None):
+    """ Run SANE discovery and store the devices found; None if SANE is
+    not available. Blocks, see DeviceDiscovery.
+    """
+    try:
+        import sane
+    except ImportError:
+        return None
+    try:
+        sane.init()
+        devices = [tuple(device) for device in sane.get_devices()]
+    except Exception as ex:
+        print("SANE discovery failed: %s" % ex, file=sys.stderr)
+        return []
+    entry = {'time': time.time(),
+             'list': [list(device) for device in devices]}
+    _store(path, lambda data: data.update(devices=entry))
+    return devices
+
+
+def options_summary(options):
+    """ Options Lector uses from sane get_options() rows: maximal width and
+    height (mm), (minimal, maximal) resolution and colour modes, None for
+    the ones the device does not have
+
+    >>> summary = options_summary([
+    ...     (9, 'br-x', '', '', 2, 3, 4, 5, (0., 215.9, 0.)),
+    ...     (3, 'resolution', '', '', 1, 4, 4, 5, [75, 150, 300]),
+    ...     (2, 'mode', '', '', 3, 0, 8, 5, ['Color', 'Gray'])])
+    >>> summary['width'], summary['height'], summary['resolution']
+    (215.9, None, [75, 300])
+    """
+    # constraint of every option by name: (min, max, quant) for ranges,
+    # a list of the allowed values otherwise
+    dOptions = dict([(opt[1], opt[-1]) for opt in options])
+    summary = {'width': None, 'height': None, 'resolution': None,
+               'modes': None}
+    for key, name in (('width', 'br-x'), ('height', 'br-y')):
+        if isinstance(dOptions.get(name), tuple):
+            summary[key] = dOptions[name][1]
+    resolution = dOptions.get('resolution')
+    if isinstance(resolution, tuple):
+        summary['resolution'] = [resolution[0], resolution[1]]
+    elif resolution:
+        summary['resolution'] = [min(resolution), max(resolution)]
+    if dOptions.get('mode'):
+        summary['modes'] = list(dOptions['mode'])
+    return summary
+
+
+def cached_options(device, maxAge=OPTIONS_TTL, path=None):
+    """ Stored options_summary() of device, None if there is none younger
+    than maxAge seconds (any age with maxAge None)
+    """
+    entry = _load(path).get('options', {}).get(device)
+    if not entry:
+        return None
+    if maxAge is not None and time.time() - entry['time'] > maxAge:
+        return None
+    return entry['options']
+
+
+def device_options(device, refresh=False, path=None):
+    """ options_summary() of device, opened only when the stored options
+    are too old or with refresh set; SANE must be initialized
+    """
+    if not refresh:
+        options = cached_options(device, path=path)
+        if options is not None:
+            return options
+    import sane
+    saneScanner = sane.open(device)
+    try:
+        options = options_summary(saneScanner.get_options())
+    finally:
+        saneScanner.close()
+    entry = {'time': time.time(), 'options': options}
+    _store(path, lambda data: data.setdefault('options', {}).update(
+        {device: entry}))
+    return options
+
+
+def clamp_parameters(options, width, height, resolution, mode):
+    """ (width, height, resolution, mode) of a scan within the limits of
+    device options (see options_summary)
+
+    >>> options = {'width': 215.9, 'height': 297.2,
+    ...            'resolution': [75, 1200], 'modes': ['Color', 'Gray']}
+    >>> clamp_parameters(options, 250, 297, 2400, 'Lineart')
+    (215, 297, 1200, 'Color')
+    """
+    if options['width'] is not None:
+        width = min(width, int(options['width']))
+    if options['height'] is not None:
+        height = min(height, int(options['height']))
+    if options['resolution'] is not None:
+        minimum, maximum = options['resolution']
+        resolution = max(minimum, min(resolution, maximum))
+    if options['modes'] and mode not in options['modes']:
+        mode = options['modes'][0]
+    return width, height, resolution, mode
+
+
+class DeviceDiscovery(QObject):
+    """ Runs discover() in a background thread
+    """
+    ## devices found, None if SANE is not available
+    discovered = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self._thread = None
+
+    def isRunning(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.isRunning():
+            return
+        # a daemon thread: a scanner that does not answer must not keep
+        # Lector from exiting
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        devices = discover()
+        try:
+            self.discovered.emit(devices)
+        except RuntimeError:
+            # the window was closed meanwhile
+            pass
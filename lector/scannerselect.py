@@ -13,7 +13,7 @@ from PyQt4.QtGui import QDialog
 from PyQt4.QtCore import SIGNAL
 
 from ui.ui_scanner import Ui_Scanner
-import sane
+import scannercache
 from utils import settings
 
 
@@ -42,51 +42,43 @@ class ScannerSelect(QDialog):
         self.updateForm()
         self.connect(self.ui.combScanner, SIGNAL("currentIndexChanged(int)"),
                      self.updateForm)
+        self.connect(self.ui.btnRefresh, SIGNAL("clicked()"),
+                     self.refreshForm)
 
-    def updateForm(self):
-        """ Get data from scanner and present them in dialog
+    def refreshForm(self):
+        """ Read the options of the selected scanner again
         """
-        selectedScanner = self.sane_list[self.ui.combScanner.currentIndex()][0]
-        saneScanner = sane.open(selectedScanner)
+        self.updateForm(refresh=True)
 
-        # this is a list with a lot of info
-        options = saneScanner.get_options()
-        saneScanner.close()
+    def updateForm(self, index=None, refresh=False):
+        """ Get data from scanner and present them in dialog
 
-        # extract just the info we want and put them in a dict
-        dOptions = dict([(opt[1], opt[-1]) for opt in options])
-        # print '\n'.join(["%s: %s" % (k, str(v)) for k, \
-        #    v in sorted(dOptions.items())])
+        The options are read from the device only if the cached ones are
+        old (scannercache.OPTIONS_TTL) or with refresh set.
+        """
+        selectedScanner = self.sane_list[self.ui.combScanner.currentIndex()][0]
+        options = scannercache.device_options(selectedScanner, refresh)
 
         #set max and min, if available
-        try:
-            self.ui.sbHeight.setMaximum(int(dOptions['br-y'][1]))
-            self.ui.sbWidth.setMaximum(int(dOptions['br-x'][1]))
-        except KeyError:
-            ##TODO: if not available (a webcam?) do not use them in scanimage!
-            pass
+        ##TODO: if not available (a webcam?) do not use them in scanimage!
+        if options['height'] is not None:
+            self.ui.sbHeight.setMaximum(int(options['height']))
+        if options['width'] is not None:
+            self.ui.sbWidth.setMaximum(int(options['width']))
 
         #set resolution
-        try:
-            minimum = min(dOptions['resolution'])
-            maximum = max(dOptions['resolution'])
-        except KeyError:
-            pass
-        else:
+        if options['resolution'] is not None:
+            minimum, maximum = options['resolution']
             value = max(minimum, min(300, maximum))
             self.ui.sbResolution.setMaximum(maximum)
             self.ui.sbResolution.setMinimum(minimum)
             self.ui.sbResolution.setValue(value)
 
         #set color mode
-        try:
-            modes = dOptions['mode']
-        except KeyError:
-            pass
-        else:
+        if options['modes']:
             combo = self.ui.combColor
             combo.clear()
-            combo.addItems(modes)
+            combo.addItems(options['modes'])
 
     def accept(self):
         """ Store settings on OK
@@ -13,6 +13,7 @@
 from PyQt4.QtCore import Qt, QThread, QProcess, pyqtSignal
 from PyQt5.QtWidgets import QProgressDialog
 
+import scannercache
 from utils import settings
 
 class ScanimageProcess(QProcess):
@@ -64,6 +65,12 @@ class ScannerThread(QThread):
 
         resolution = settings.get('scanner:resolution')
         mode = settings.get('scanner:mode')
+        # settings may be older than the device options (or made for
+        # another device)
+        options = scannercache.cached_options(self.device, maxAge=None)
+        if options is not None:
+            br_x, br_y, resolution, mode = scannercache.clamp_parameters(
+                options, br_x, br_y, resolution, mode)
 
         self.process = ScanimageProcess(self.device, mode, resolution,
                                         (br_x, br_y))
@@ -25,6 +25,8 @@ from utils import get_spellchecker_languages
 
 class Settings(QDialog):
 	colors = ['Color', 'Gray', 'Lineart']
+	engines = ['auto', 'cli', 'library']
+	thresholds = ['', 'otsu', 'sauvola']
 	settingAccepted = pyqtSignal()
 
 	def __init__(self, parent = None, tabIndex = 0):
@@ -112,11 +114,34 @@ class Settings(QDialog):
 		self.ui.lnTessExec.setText(tessExec)
 		tessData = settings.get('tesseract-ocr:TESSDATA_PREFIX')
 		self.ui.lnTessData.setText(tessData)
+		self.ui.sbWorkers.setValue(settings.get('tesseract-ocr:workers'))
+		engine = settings.get('tesseract-ocr:engine')
+		if engine in self.engines:
+			self.ui.combEngine.setCurrentIndex(self.engines.index(engine))
+		self.ui.cbCache.setChecked(settings.get('ocr:cache'))
+		self.ui.sbCacheSize.setValue(settings.get('ocr:cacheSize'))
+		stages = settings.get('ocr:preprocess').split(',')
+		self.ui.cbDeskew.setChecked('deskew' in stages)
+		self.ui.cbMedian.setChecked('median' in stages)
+		for i, threshold in enumerate(self.thresholds):
+			if threshold in stages:
+				self.ui.combThreshold.setCurrentIndex(i)
+		self.ui.cbDespeckle.setChecked('despeckle' in stages)
+		self.on_combThreshold_currentIndexChanged(
+			self.ui.combThreshold.currentIndex())
+		self.ui.sbLowConfidence.setValue(settings.get('ocr:lowConfidence'))
+		self.ui.cbRefine.setChecked(settings.get('ocr:refine'))
+		self.ui.cbClassify.setChecked(settings.get('ocr:classify'))
 
 		self.ui.cbLog.setChecked(settings.get('log:errors'))
 		self.ui.lnLog.setText(settings.get('log:filename'))
 
 
+	@pyqtSlot(int)
+	def on_combThreshold_currentIndexChanged(self, index):
+		# despeckle works on the bilevel page of a binarization stage
+		self.ui.cbDespeckle.setEnabled(index > 0)
+
 	@pyqtSlot()
 	def on_fontButton_clicked(self):
 		ok = False
@@ -223,6 +248,22 @@ class Settings(QDialog):
 		settings.set('tesseract-ocr:test', self.ui.lnTessExec.text())
 		settings.set('tesseract-ocr:TESSDATA_PREFIX',
 					 self.ui.lnTessData.text())
+		settings.set('tesseract-ocr:workers', self.ui.sbWorkers.value())
+		settings.set('tesseract-ocr:engine',
+					 self.engines[self.ui.combEngine.currentIndex()])
+		settings.set('ocr:cache', self.ui.cbCache.isChecked())
+		settings.set('ocr:cacheSize', self.ui.sbCacheSize.value())
+		stages = [self.thresholds[self.ui.combThreshold.currentIndex()]]
+		for stage, checkBox in (('deskew', self.ui.cbDeskew),
+								('median', self.ui.cbMedian),
+								('despeckle', self.ui.cbDespeckle)):
+			if checkBox.isChecked() and checkBox.isEnabled():
+				stages.append(stage)
+		# order does not matter, stages always run in pipeline order
+		settings.set('ocr:preprocess', ','.join(s for s in stages if s))
+		settings.set('ocr:lowConfidence', self.ui.sbLowConfidence.value())
+		settings.set('ocr:refine', self.ui.cbRefine.isChecked())
+		settings.set('ocr:classify', self.ui.cbClassify.isChecked())
 
 		if self.ui.cbLog.isChecked():
 			filename = self.ui.lnLog.text()
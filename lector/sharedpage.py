@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: sharedpage.py
+
+    Page image in a multiprocessing.shared_memory block, so that worker
+    processes crop their areas from one copy of the page instead of
+    getting pickled crops or opening the file again. Workers receive only
+    the descriptor (name, shape, dtype) and the area boxes.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+
+class SharedPage(object):
+    """ uint8 page array copied once to shared memory
+
+    The creating process owns the block: close() frees it, also when used
+    as a context manager.
+
+    >>> page = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    >>> with SharedPage(page) as shared:
+    ...     view = attach(shared.descriptor)
+    ...     view[1:3, 2:4].tolist()
+    [[6, 7], [10, 11]]
+    >>> detach(shared.descriptor[0])
+    """
+    def __init__(self, array):
+        array = np.asarray(array)
+        self._shm = shared_memory.SharedMemory(create=True,
+                                               size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, array.dtype, self._shm.buf)
+        self.array[...] = array
+        ## everything a worker needs to attach, picklable
+        self.descriptor = (self._shm.name, array.shape, array.dtype.str)
+        _owned[self._shm.name] = self._shm
+
+    def close(self):
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        del _owned[shm.name]
+        # the owner's view must go before the block can be closed
+        del self.array
+        try:
+            shm.close()
+        except BufferError:
+            # views from attach() in this process are still alive, the
+            # mapping goes with the last of them
+            pass
+        finally:
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+## blocks made by this process and blocks attached by this (worker)
+## process, by name
+_owned = {}
+_attached = {}
+
+def attach(descriptor):
+    """ Read only array view of a SharedPage in another process
+
+    The block stays attached for the next areas of the same page; blocks
+    of older pages are detached.
+    """
+    name, shape, dtype = descriptor
+    if name in _owned:
+        shm = _owned[name]
+    else:
+        if name not in _attached:
+            for old in list(_attached):
+                detach(old)
+            shm = shared_memory.SharedMemory(name=name)
+            # the block belongs to the process that made it, the worker
+            # must not unlink it when it exits
+            resource_tracker.unregister(shm._name, 'shared_memory')
+            _attached[name] = shm
+        shm = _attached[name]
+    view = np.ndarray(shape, np.dtype(dtype), shm.buf)
+    view.flags.writeable = False
+    return view
+
+
+def detach(name):
+    shm = _attached.pop(name, None)
+    if shm is not None:
+        try:
+            shm.close()
+        except BufferError:
+            # a view is still alive, the block goes with the process
+            pass
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: startup.py
+
+    Wall time of the startup phases, printed with --profile-startup.
+    Phases are marked in order from the first import of this module (which
+    lector.py does before anything heavy) until the window is shown; work
+    deferred after show() (tesseract probe, scanner discovery) is timed
+    apart, it does not delay the window.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import sys
+import time
+from contextlib import contextmanager
+
+enabled = '--profile-startup' in sys.argv
+
+_start = time.perf_counter()
+_last = _start
+## [(phase, seconds)] before the window, then after it
+_phases = []
+_deferred = []
+_shown = None
+
+
+def mark(name):
+    """ End phase name, which began at the previous mark
+    """
+    global _last
+    now = time.perf_counter()
+    _phases.append((name, now - _last))
+    _last = now
+
+
+def shown():
+    """ The window is on screen, later phases are deferred ones
+    """
+    global _shown
+    mark('show')
+    _shown = _last - _start
+
+
+@contextmanager
+def phase(name):
+    """ Time a deferred phase
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _deferred.append((name, time.perf_counter() - start))
+
+
+def format_phases(phases):
+    """ 'phase 12 ms, ...'
+
+    >>> format_phases([('imports', .1204), ('UI setup', .045)])
+    'imports 120 ms, UI setup 45 ms'
+    """
+    return ', '.join('%s %d ms' % (name, round(seconds * 1000))
+                     for name, seconds in phases)
+
+
+def report():
+    """ Print the phases if profiling was asked for
+    """
+    if not enabled:
+        return
+    print("Startup: %s" % format_phases(_phases))
+    if _shown is not None:
+        print("Window shown after %d ms" % round(_shown * 1000))
+    if _deferred:
+        print("After show: %s" % format_phases(_deferred))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: tessprobe.py
+
+    What the installed tesseract can do: its languages, version and
+    features (stdin input, TSV and hOCR output, OpenMP). Probing runs
+    tesseract, so the result is kept on disk and reused as long as the
+    executable and the tessdata directory did not change (same path and
+    mtime); checking this costs only a few stat calls.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import os
+import re
+import sys
+import json
+import shutil
+from subprocess import Popen, PIPE, STDOUT
+
+from PyQt6.QtCore import QStandardPaths, QThread, pyqtSignal
+
+from utils import settings
+
+## bump when the probe records change
+PROBE_FORMAT = 1
+
+
+def default_path():
+    cache_dir = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(cache_dir, 'lector', 'tesseract-probe.json')
+
+
+def executable():
+    """ Full path of the configured tesseract executable, None if it is
+    not found
+    """
+    tess_exec = settings.get('tesseract-ocr:executable') or 'tesseract'
+    return shutil.which(tess_exec)
+
+
+def tessdata_dir():
+    """ tessdata directory from settings or environment, None if tesseract
+    uses its default
+    """
+    prefix = settings.get('tesseract-ocr:TESSDATA_PREFIX')
+    if not prefix:
+        return os.getenv('TESSDATA_PREFIX') or None
+    # same as libtesseract: the setting is documented without 'tessdata'
+    tessdata = os.path.join(prefix, 'tessdata')
+    if os.path.isdir(tessdata):
+        return tessdata
+    return prefix
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except (OSError, TypeError):
+        return None
+
+
+def parse_version(version):
+    """ (major, minor) of tesseract's version line, (0, 0) if unknown
+
+    >>> parse_version('tesseract 5.3.0')
+    (5, 3)
+    >>> parse_version('tesseract v4.0.0-beta.1')
+    (4, 0)
+    """
+    match = re.search(r'(\d+)\.(\d+)', version)
+    if not match:
+        return (0, 0)
+    return (int(match.group(1)), int(match.group(2)))
+
+
+def parse_languages(output):
+    """ (languages, tessdata directory or None) from 'tesseract
+    --list-langs'
+
+    >>> parse_languages('List of available languages in '
+    ...                 '"/usr/share/tessdata/" (2):\\neng\\nosd\\n')
+    (['eng', 'osd'], '/usr/share/tessdata/')
+    """
+    languages = None
+    tessdata = None
+    for row in output.replace('\r\n', '\n').split('\n'):
+        if row.startswith('List of'):
+            languages = []
+            match = re.search(r'"(.+)"', row)
+            if match:
+                tessdata = match.group(1)
+        elif languages is not None and row.strip():
+            languages.append(row.strip())
+    return languages, tessdata
+
+
+def features(version, versionOutput=''):
+    """ Features of tesseract version (line), versionOutput is the full
+    output of 'tesseract --version'
+    """
+    number = parse_version(version)
+    return {'stdin': number >= (3, 3),
+            'tsv': number >= (3, 5),
+            'hocr': number >= (3, 0),
+            'openmp': 'Found OpenMP' in versionOutput}
+
+
+def _run(command, env):
+    output = Popen(command, shell=False, stdout=PIPE, stderr=STDOUT,
+                   env=env).communicate()[0]
+    return output.decode('utf-8', 'replace')
+
+
+def _library_probe():
+    """ Probe of libtesseract for systems without the executable
+    """
+    if settings.get('tesseract-ocr:engine') == 'cli':
+        return None
+    import libtesseract
+    library = libtesseract.load()
+    if not library:
+        return None
+    try:
+        languages = library.languages()
+    except libtesseract.TessError as ex:
+        print("Could not list libtesseract languages: %s" % ex,
+              file=sys.stderr)
+        return None
+    version = library.version()
+    return {'languages': languages, 'version': version,
+            'features': features(version)}
+
+
+def probe(path=None):
+    """ Run tesseract and store what it can do; returns the probe record
+    ({'languages', 'version', 'features'}) or None if there is no
+    tesseract
+    """
+    tess_exec = executable()
+    tessdata = tessdata_dir()
+    env = dict(os.environ)
+    if tessdata:
+        env['TESSDATA_PREFIX'] = tessdata
+    if not tess_exec:
+        return _library_probe()
+    try:
+        versionOutput = _run([tess_exec, '--version'], env)
+        listOutput = _run([tess_exec, '--list-langs'], env)
+    except OSError as ex:
+        print("Could not run tesseract '%s': %s" % (tess_exec, ex),
+              file=sys.stderr)
+        return _library_probe()
+
+    languages, listed = parse_languages(listOutput)
+    if languages is None:
+        # tesseract < 3.02 has no --list-langs, nor does a broken install
+        print("tesseract '%s' did not list its languages:\n%s"
+              % (tess_exec, listOutput.strip()), file=sys.stderr)
+        return None
+    version = versionOutput.strip().split('\n')[0]
+    record = {'languages': languages, 'version': version,
+              'features': features(version, versionOutput)}
+
+    tessdata = tessdata or listed
+    _store(path, tess_exec, {
+        'format': PROBE_FORMAT,
+        'mtime': _mtime(tess_exec),
+        'tessdata': tessdata,
+        'tessdataMtime': _mtime(tessdata),
+        'probe': record})
+    return record
+
+
+def _load(path):
+    try:
+        with open(path or default_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store(path, tess_exec, entry):
+    path = path or default_path()
+    entries = _load(path)
+    entries[tess_exec] = entry
+    directory = os.path.dirname(path)
+    try:
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # several Lector processes may write at once, replace atomically
+        temp = '%s.%d' % (path, os.getpid())
+        with open(temp, 'w') as f:
+            json.dump(entries, f, indent=1)
+        os.replace(temp, path)
+    except OSError as ex:
+        print("Could not store tesseract probe: %s" % ex, file=sys.stderr)
+
+
+def cached_probe(path=None, stale=False):
+    """ Stored probe record of the configured tesseract without running
+    it, None if there is none. Records of a changed executable or
+    tessdata directory are returned only with stale set.
+    """
+    tess_exec = executable()
+    if not tess_exec:
+        return None
+    entry = _load(path).get(tess_exec)
+    if not entry or entry.get('format') != PROBE_FORMAT:
+        return None
+    if not stale:
+        tessdata = tessdata_dir() or entry['tessdata']
+        if entry['mtime'] != _mtime(tess_exec) \
+                or tessdata != entry['tessdata'] \
+                or entry['tessdataMtime'] != _mtime(tessdata):
+            return None
+    return entry['probe']
+
+
+class ProbeThread(QThread):
+    """ Probes tesseract again in the background
+    """
+    ## new probe record, None if tesseract is not available
+    probed = pyqtSignal(object)
+
+    def run(self):
+        self.probed.emit(probe())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Lector: tilepyramid.py
+
+    Multi-resolution tiles of the page for OcrScene.drawBackground. Level 0
+    is the page itself, every next level has half of the resolution. Only
+    the tiles visible at the level matching the view scale are converted to
+    QImage; they are kept in an LRU cache with a memory budget.
+
+    Copyright (C) 2011-2014 Davide Setti, Zdenko Podobný
+
+    This program is released under the GNU GPLv2
+"""
+#pylint: disable-msg=C0103
+
+import math
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QRectF
+from PyQt6.QtWidgets import QStyleOptionGraphicsItem
+
+from utils import pilImage2Qt
+
+TILE_SIZE = 256
+TILE_BUDGET = 64 * 1024 * 1024
+
+
+class TilePyramid(object):
+    def __init__(self, im, onReady=None, budget=TILE_BUDGET):
+        self.levels = [im]
+        self.budget = budget
+        self.memory = 0
+        self.tiles = OrderedDict()
+        self.onReady = onReady
+
+        thread = threading.Thread(target=self._buildLevels)
+        thread.daemon = True
+        thread.start()
+
+    def _buildLevels(self):
+        """ Downscaled levels, computed in background thread
+        """
+        level = self.levels[0]
+        try:
+            # Image.reduce does not take bilevel, palette or 16 bit pages
+            if level.mode not in ('L', 'RGB', 'RGBA'):
+                if level.mode in ('1', 'I', 'I;16', 'F'):
+                    level = level.convert('L')
+                elif 'A' in level.getbands() or 'transparency' in level.info:
+                    level = level.convert('RGBA')
+                else:
+                    level = level.convert('RGB')
+            while max(level.size) > TILE_SIZE:
+                level = level.reduce(2)
+                # list.append is atomic, painting uses what is ready
+                self.levels.append(level)
+        except (ValueError, OSError, MemoryError) as ex:
+            # painting uses the levels made so far
+            print("Could not build page levels: %s" % ex)
+        if self.onReady:
+            self.onReady(self)
+
+    def levelFor(self, scale):
+        """ Coarsest level that still has at least one pixel per device pixel
+        """
+        level = 0
+        while scale <= .5 and level + 1 < len(self.levels):
+            scale *= 2
+            level += 1
+        return level
+
+    def tile(self, level, tx, ty):
+        key = (level, tx, ty)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+
+        im = self.levels[level]
+        box = (tx * TILE_SIZE, ty * TILE_SIZE,
+               min((tx + 1) * TILE_SIZE, im.size[0]),
+               min((ty + 1) * TILE_SIZE, im.size[1]))
+        tile = pilImage2Qt(im.crop(box))
+        self.tiles[key] = tile
+        self.memory += tile.sizeInBytes()
+
+        while self.memory > self.budget and len(self.tiles) > 1:
+            _, old = self.tiles.popitem(last=False)
+            self.memory -= old.sizeInBytes()
+        return tile
+
+    def paint(self, painter, rect):
+        """ Draw tiles intersecting rect (scene coordinates)
+        """
+        if rect.isEmpty():
+            return
+        scale = QStyleOptionGraphicsItem.levelOfDetailFromTransform(
+            painter.worldTransform())
+        level = self.levelFor(scale)
+        factor = 2 ** level
+        im = self.levels[level]
+        span = TILE_SIZE * factor
+
+        columns = int(math.ceil(im.size[0] / float(TILE_SIZE)))
+        rows = int(math.ceil(im.size[1] / float(TILE_SIZE)))
+        left = max(0, int(rect.left() // span))
+        top = max(0, int(rect.top() // span))
+        right = min(columns - 1, int(rect.right() // span))
+        bottom = min(rows - 1, int(rect.bottom() // span))
+
+        for ty in range(top, bottom + 1):
+            for tx in range(left, right + 1):
+                tile = self.tile(level, tx, ty)
+                painter.drawImage(QRectF(tx * span, ty * span,
+                                         tile.width() * factor,
+                                         tile.height() * factor), tile)
@@ -25,9 +25,16 @@ class Ui_Scanner(object):
         self.groupBox_3.setObjectName("groupBox_3")
         self.formLayout = QtWidgets.QFormLayout(self.groupBox_3)
         self.formLayout.setObjectName("formLayout")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
         self.combScanner = QtWidgets.QComboBox(self.groupBox_3)
         self.combScanner.setObjectName("combScanner")
-        self.formLayout.setWidget(0, QtWidgets.QFormLayout.SpanningRole, self.combScanner)
+        self.horizontalLayout_2.addWidget(self.combScanner)
+        self.btnRefresh = QtWidgets.QPushButton(self.groupBox_3)
+        self.btnRefresh.setObjectName("btnRefresh")
+        self.horizontalLayout_2.addWidget(self.btnRefresh)
+        self.horizontalLayout_2.setStretch(0, 1)
+        self.formLayout.setLayout(0, QtWidgets.QFormLayout.SpanningRole, self.horizontalLayout_2)
         self.verticalLayout_2.addWidget(self.groupBox_3)
         self.groupBox = QtWidgets.QGroupBox(self.widget)
         self.groupBox.setObjectName("groupBox")
@@ -94,6 +101,8 @@ class Ui_Scanner(object):
         _translate = QtCore.QCoreApplication.translate
         Scanner.setWindowTitle(_translate("Scanner", "Select scanner"))
         self.groupBox_3.setTitle(_translate("Scanner", "Scanner"))
+        self.btnRefresh.setToolTip(_translate("Scanner", "Read the options of the scanner again"))
+        self.btnRefresh.setText(_translate("Scanner", "Refresh"))
         self.groupBox.setTitle(_translate("Scanner", "Size"))
         self.label_2.setText(_translate("Scanner", "Width (mm)"))
         self.label.setText(_translate("Scanner", "Height (mm)"))
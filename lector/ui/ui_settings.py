@@ -186,6 +186,70 @@ class Ui_Settings(object):
 		self.lblNote.setWordWrap(True)
 		self.lblNote.setObjectName("lblNote")
 		self.tabWidget.addTab(self.tesseract, "")
+		self.ocr = QtWidgets.QWidget()
+		self.ocr.setObjectName("ocr")
+		self.formLayout_4 = QtWidgets.QFormLayout(self.ocr)
+		self.formLayout_4.setObjectName("formLayout_4")
+		self.lblWorkers = QtWidgets.QLabel(self.ocr)
+		self.lblWorkers.setObjectName("lblWorkers")
+		self.formLayout_4.setWidget(0, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lblWorkers)
+		self.sbWorkers = QtWidgets.QSpinBox(self.ocr)
+		self.sbWorkers.setMinimum(1)
+		self.sbWorkers.setMaximum(64)
+		self.sbWorkers.setObjectName("sbWorkers")
+		self.formLayout_4.setWidget(0, QtWidgets.QFormLayout.ItemRole.FieldRole, self.sbWorkers)
+		self.lblEngine = QtWidgets.QLabel(self.ocr)
+		self.lblEngine.setObjectName("lblEngine")
+		self.formLayout_4.setWidget(1, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lblEngine)
+		self.combEngine = QtWidgets.QComboBox(self.ocr)
+		self.combEngine.setObjectName("combEngine")
+		self.combEngine.addItem("")
+		self.combEngine.addItem("")
+		self.combEngine.addItem("")
+		self.formLayout_4.setWidget(1, QtWidgets.QFormLayout.ItemRole.FieldRole, self.combEngine)
+		self.cbCache = QtWidgets.QCheckBox(self.ocr)
+		self.cbCache.setObjectName("cbCache")
+		self.formLayout_4.setWidget(2, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.cbCache)
+		self.lblCacheSize = QtWidgets.QLabel(self.ocr)
+		self.lblCacheSize.setObjectName("lblCacheSize")
+		self.formLayout_4.setWidget(3, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lblCacheSize)
+		self.sbCacheSize = QtWidgets.QSpinBox(self.ocr)
+		self.sbCacheSize.setMinimum(1)
+		self.sbCacheSize.setMaximum(4096)
+		self.sbCacheSize.setObjectName("sbCacheSize")
+		self.formLayout_4.setWidget(3, QtWidgets.QFormLayout.ItemRole.FieldRole, self.sbCacheSize)
+		self.cbDeskew = QtWidgets.QCheckBox(self.ocr)
+		self.cbDeskew.setObjectName("cbDeskew")
+		self.formLayout_4.setWidget(4, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.cbDeskew)
+		self.cbMedian = QtWidgets.QCheckBox(self.ocr)
+		self.cbMedian.setObjectName("cbMedian")
+		self.formLayout_4.setWidget(5, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.cbMedian)
+		self.lblThreshold = QtWidgets.QLabel(self.ocr)
+		self.lblThreshold.setObjectName("lblThreshold")
+		self.formLayout_4.setWidget(6, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lblThreshold)
+		self.combThreshold = QtWidgets.QComboBox(self.ocr)
+		self.combThreshold.setObjectName("combThreshold")
+		self.combThreshold.addItem("")
+		self.combThreshold.addItem("")
+		self.combThreshold.addItem("")
+		self.formLayout_4.setWidget(6, QtWidgets.QFormLayout.ItemRole.FieldRole, self.combThreshold)
+		self.cbDespeckle = QtWidgets.QCheckBox(self.ocr)
+		self.cbDespeckle.setObjectName("cbDespeckle")
+		self.formLayout_4.setWidget(7, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.cbDespeckle)
+		self.lblLowConfidence = QtWidgets.QLabel(self.ocr)
+		self.lblLowConfidence.setObjectName("lblLowConfidence")
+		self.formLayout_4.setWidget(8, QtWidgets.QFormLayout.ItemRole.LabelRole, self.lblLowConfidence)
+		self.sbLowConfidence = QtWidgets.QSpinBox(self.ocr)
+		self.sbLowConfidence.setMaximum(100)
+		self.sbLowConfidence.setObjectName("sbLowConfidence")
+		self.formLayout_4.setWidget(8, QtWidgets.QFormLayout.ItemRole.FieldRole, self.sbLowConfidence)
+		self.cbRefine = QtWidgets.QCheckBox(self.ocr)
+		self.cbRefine.setObjectName("cbRefine")
+		self.formLayout_4.setWidget(9, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.cbRefine)
+		self.cbClassify = QtWidgets.QCheckBox(self.ocr)
+		self.cbClassify.setObjectName("cbClassify")
+		self.formLayout_4.setWidget(10, QtWidgets.QFormLayout.ItemRole.SpanningRole, self.cbClassify)
+		self.tabWidget.addTab(self.ocr, "")
 		self.misc = QtWidgets.QWidget()
 		self.misc.setObjectName("misc")
 		self.cbLog = QtWidgets.QCheckBox(self.misc)
@@ -242,7 +306,7 @@ class Ui_Settings(object):
 		self.verticalLayout_2.addLayout(self.verticalLayout)
 
 		self.retranslateUi(Settings)
-		self.tabWidget.setCurrentIndex(4)
+		self.tabWidget.setCurrentIndex(5)
 		self.buttonBox.accepted.connect(Settings.accept) # type: ignore
 		self.buttonBox.rejected.connect(Settings.reject) # type: ignore
 		self.buttonBox.rejected.connect(Settings.close) # type: ignore
@@ -301,6 +365,31 @@ class Ui_Settings(object):
 		self.pbTessExec.setText(_translate("Settings", "..."))
 		self.lblNote.setText(_translate("Settings", "<html><head/><body><p><span style=\" font-weight:600; color:#ff0000;\">Note:</span> If field is blank, Lector will try to use your system settings (Environment variables <span style=\" font-weight:600;\">path</span> and <span style=\" font-weight:600;\">TESSDATA_PREFIX</span>)</p></body></html>"))
 		self.tabWidget.setTabText(self.tabWidget.indexOf(self.tesseract), _translate("Settings", "Tesseract"))
+		self.lblWorkers.setText(_translate("Settings", "Parallel workers:"))
+		self.sbWorkers.setToolTip(_translate("Settings", "<html><head/><body><p>Number of areas recognized at the same time</p></body></html>"))
+		self.lblEngine.setText(_translate("Settings", "Engine:"))
+		self.combEngine.setToolTip(_translate("Settings", "<html><head/><body><p>Library keeps language models loaded between areas; Automatic uses it if libtesseract is installed</p></body></html>"))
+		self.combEngine.setItemText(0, _translate("Settings", "Automatic"))
+		self.combEngine.setItemText(1, _translate("Settings", "Command line"))
+		self.combEngine.setItemText(2, _translate("Settings", "Library"))
+		self.cbCache.setText(_translate("Settings", "Reuse results of already recognized areas"))
+		self.lblCacheSize.setText(_translate("Settings", "Cache size:"))
+		self.sbCacheSize.setSuffix(_translate("Settings", " MB"))
+		self.cbDeskew.setText(_translate("Settings", "Straighten skewed pages"))
+		self.cbMedian.setText(_translate("Settings", "Remove noise (median filter)"))
+		self.lblThreshold.setText(_translate("Settings", "Binarization:"))
+		self.combThreshold.setItemText(0, _translate("Settings", "None"))
+		self.combThreshold.setItemText(1, _translate("Settings", "Otsu (global)"))
+		self.combThreshold.setItemText(2, _translate("Settings", "Sauvola (local)"))
+		self.cbDespeckle.setText(_translate("Settings", "Remove specks and fill holes"))
+		self.lblLowConfidence.setText(_translate("Settings", "Low confidence below:"))
+		self.sbLowConfidence.setToolTip(_translate("Settings", "Words recognized with lower confidence are highlighted"))
+		self.sbLowConfidence.setSuffix(_translate("Settings", " %"))
+		self.cbRefine.setToolTip(_translate("Settings", "Lines with low confidence are read again with other settings; the best result is kept"))
+		self.cbRefine.setText(_translate("Settings", "Read low confidence lines again"))
+		self.cbClassify.setToolTip(_translate("Settings", "Text areas are checked before OCR: blank ones are skipped, pictures are kept as pictures"))
+		self.cbClassify.setText(_translate("Settings", "Skip blank areas and pictures"))
+		self.tabWidget.setTabText(self.tabWidget.indexOf(self.ocr), _translate("Settings", "OCR"))
 		self.cbLog.setText(_translate("Settings", "Log errors to file"))
 		self.lnLog.setToolTip(_translate("Settings", "<html><head/><body><p>Path to the tessdata directory (without \'tessdata\')</p></body></html>"))
 		self.lblNote_2.setText(_translate("Settings", "<html><head/><body><p><span style=\" font-weight:600; color:#000000;\">Note:</span> Logging will be started after new start of application if this option will be checked.</p></body></html>"))
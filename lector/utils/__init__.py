@@ -16,6 +16,7 @@ import os
 
 from glob import glob
 from subprocess import Popen, PIPE
+from PyQt6.QtCore import QResource
 from PyQt6.QtGui import QImage
 
 # workaroung to run textwidget outside of Lector
@@ -26,21 +27,51 @@ if CMD_FOLDER not in sys.path:
 
 from utils import settings
 
+## compiled resources made by 'make rcc', optional
+RESOURCE_BUNDLE = os.path.join(CMD_FOLDER, 'ui', 'resources.rcc')
 
-def pilImage2Qt(im):
-	if im.mode != 'RGB':
-		im = im.convert('RGB')
-	# was im.tostring
-	s = im.tobytes("jpeg", "RGB")
+QIMAGE_FORMATS = {
+	'L': QImage.Format.Format_Grayscale8,
+	'RGB': QImage.Format.Format_RGB888,
+	'RGBA': QImage.Format.Format_RGBA8888,
+	}
 
-	qtimage = QImage()
-	qtimage.loadFromData(s)
+def pilImage2Qt(im):
+	"""
+	Wrap pixel buffer of PIL image in QImage without any encoding.
 
-#	from PIL import ImageQt
-#	qtimage = ImageQt.ImageQt(im)
+	Modes without matching QImage format are converted first; for L, RGB
+	and RGBA images the raw buffer is the only copy.
+	"""
+	if im.mode not in QIMAGE_FORMATS:
+		if im.mode == '1':
+			im = im.convert('L')
+		elif 'A' in im.getbands() or 'transparency' in im.info:
+			im = im.convert('RGBA')
+		else:
+			im = im.convert('RGB')
+	data = im.tobytes('raw', im.mode)
+	width, height = im.size
+	qtimage = QImage(data, width, height, width * len(im.getbands()),
+					 QIMAGE_FORMATS[im.mode])
+	# QImage does not own the buffer, it has to live as long as the image
+	qtimage.pilData = data
 	return qtimage
 
 
+def load_resources():
+	"""
+	Register icons and translations, returns the file they come from.
+
+	Qt maps the compiled bundle instead of copying it into Python objects
+	like ui/resources_rc.py does, which stays the fallback.
+	"""
+	if os.path.exists(RESOURCE_BUNDLE) and \
+			QResource.registerResource(RESOURCE_BUNDLE):
+		return RESOURCE_BUNDLE
+	from ui import resources_rc
+	return resources_rc.__file__
+
 def extract_tesseract_languages_path(error_message):
 	"""
 	>>> extract_tesseract_languages_path("Unable to load unicharset file /usr/share/tesseract-ocr/tessdata/invalid.unicharset")
@@ -5,6 +5,8 @@
 """
 #pylint: disable-msg=C0103
 
+import os
+
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import QSettings, QVariant, QDir, QStandardPaths
 
@@ -32,6 +34,22 @@ def get(name):
         return str(settings.value(name, "Color"))
     elif name == 'scanner:device':
         return str(settings.value(name, ""))
+    elif name == 'tesseract-ocr:workers':
+        return int(settings.value(name, os.cpu_count() or 1))
+    elif name == 'tesseract-ocr:engine':
+        return str(settings.value(name, "auto"))
+    elif name == 'ocr:cache':
+        return str(settings.value(name, "true")).lower() == "true"
+    elif name == 'ocr:cacheSize':
+        return int(settings.value(name, 64))
+    elif name == 'ocr:preprocess':
+        return str(settings.value(name, ""))
+    elif name == 'ocr:lowConfidence':
+        return int(settings.value(name, 60))
+    elif name == 'ocr:refine':
+        return str(settings.value(name, "false")).lower() == "true"
+    elif name == 'ocr:classify':
+        return str(settings.value(name, "true")).lower() == "true"
     elif name == 'editor:font':
         return settings.value(name, QFont(QFont("Courier New", 10)))
     elif name == 'editor:symbols':
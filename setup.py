@@ -30,7 +30,8 @@ setup(name = 'lector',
     author = 'Davide Setti',
     url = 'http://code.google.com/p/lector/',
     packages = ['lector', 'lector.ui', 'lector.editor', 'lector.utils'],
-    package_data = {'': ['AUTHORS', 'CREDITS', 'ChangeLog', 'LICENSE', 'README']},
+    package_data = {'': ['AUTHORS', 'CREDITS', 'ChangeLog', 'LICENSE', 'README'],
+                    'lector.ui': ['*.rcc']},
     scripts = ['./lector.pyw'],
     license = 'GPLv2',
     long_description = '''A graphical ocr solution for GNU/Linux based 